@@ -0,0 +1,322 @@
+"""Session state and helpers shared by the navigation entry point and every page."""
+import time
+from datetime import date
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from chart_series import progress_series
+from cohort_stats import CohortStats
+from content import LEVEL_UNLOCK_STARS
+from content_packs import content_index
+from goal_forecast import forecast_goals, forecast_key
+from history_export import import_profile
+from mission_engine import MissionEngine
+from persistence import GameStore
+from profiler import timed
+from profiles import (
+    DEFAULT_CHILD,
+    new_child_state,
+    new_household_state,
+    next_child_id,
+    profile_key,
+    stash_child,
+)
+from report_engine import build_report
+from review_scheduler import ReviewScheduler, quality_from_outcome
+from session_rng import SessionRng
+from theme_styles import loader_html, stale_bundles
+
+# First-run timings for this server process (module state outlives reruns).
+STARTUP = {}
+
+def record_startup(name: str, started: float):
+    STARTUP.setdefault(name, (time.perf_counter() - started) * 1000)
+
+# ============================================================
+# Helpers
+# ============================================================
+def clamp(n, lo, hi):
+    return max(lo, min(hi, n))
+
+def default_level_for_grade(child_grade: int) -> int:
+    return clamp(child_grade, 1, 6)
+
+def level_unlock_rule(level: int, stars: int) -> bool:
+    return stars >= LEVEL_UNLOCK_STARS.get(level, 9999)
+
+def compute_progress(bank_coins, goal_amount):
+    if goal_amount <= 0:
+        return 0.0
+    return clamp(bank_coins / goal_amount, 0.0, 1.0)
+
+@timed()
+def ai_coach_tip(save_stats, spend_stats, streak, level):
+    if not save_stats:
+        return "Try saving 2 coins first. Small steps are easiest."
+    avg_save = float(save_stats.mean)
+    avg_spend = float(spend_stats.mean)
+    if streak == 0:
+        return "Try an easy win: save first, then pick a tiny treat only if coins are left."
+    if avg_spend > avg_save + 2:
+        return "They spend more than they save. Try picking “I buy nothing” once this week."
+    if avg_save >= avg_spend:
+        if level <= 2:
+            return "Nice habit. Keep saving first each mission."
+        if level <= 4:
+            return "Good balance. Next step: set a spending limit before treats."
+        return "Strong choices. Keep extra coins for long-term goals."
+    return "Try increasing saving by 1 coin next time. You will feel the difference."
+
+def review_scheduler():
+    # Rebuilt when the child (their cards dict) or the content packs change.
+    cards = st.session_state.review_cards
+    scheduler = st.session_state.get("review_scheduler")
+    if scheduler is None or scheduler.cards is not cards or scheduler.index is not content_index():
+        scheduler = st.session_state.review_scheduler = ReviewScheduler(cards, rng=SessionRng(st.session_state))
+    return scheduler
+
+@timed()
+def history_report():
+    # Recomputed only when the history changes (new events, compaction or another child).
+    history = st.session_state.history
+    report = st.session_state.get("history_report")
+    if report is None or report.history is not history or report.version != history.version:
+        report = st.session_state.history_report = build_report(history)
+    return report
+
+@timed()
+def goal_forecast():
+    # Reruns reuse it; coins moving, a goal bought or new settings refresh it (see forecast_key).
+    forecast = st.session_state.get("goal_forecast")
+    if forecast is None or forecast.key != forecast_key(st.session_state):
+        forecast = st.session_state.goal_forecast = forecast_goals(st.session_state)
+    return forecast
+
+@timed()
+def progress_chart(resolution: str):
+    # Same rule as history_report, per resolution.
+    history = st.session_state.history
+    cache = st.session_state.setdefault("progress_charts", {})
+    series = cache.get(resolution)
+    if series is None or series.history is not history or series.version != history.version:
+        series = cache[resolution] = progress_series(history, resolution)
+    return series
+
+def pick_daily(level: int, kind: str):
+    return review_scheduler().next_item(level, kind, date.today().toordinal())
+
+def record_review(kind: str):
+    quality = quality_from_outcome(int(st.session_state[f"{kind}_tries"]), st.session_state[f"{kind}_star_awarded"])
+    if quality is not None:
+        review_scheduler().grade(st.session_state[f"{kind}_ref"], quality, date.today().toordinal())
+
+def daily_item(kind: str):
+    # Sessions keep item ids into the shared content index, not copies.
+    index = content_index()
+    ref = st.session_state[f"{kind}_ref"]
+    item = index.item(ref) if isinstance(ref, str) else None
+    if item is None:
+        # Saved before item ids existed, or the item left its pack in a reload.
+        ref = st.session_state[f"{kind}_ref"] = pick_daily(int(st.session_state.level), kind)
+        item = index.item(ref)
+    return item
+
+def reset_daily_content_for_level(level: int):
+    st.session_state.quiz_done_today = False
+    st.session_state.puzzle_done_today = False
+    st.session_state.quiz_feedback = None
+    st.session_state.puzzle_feedback = None
+    st.session_state.quiz_ref = pick_daily(level, "quiz")
+    st.session_state.puzzle_ref = pick_daily(level, "puzzle")
+    st.session_state.last_level_for_daily = level
+
+    st.session_state.quiz_tries = 0
+    st.session_state.quiz_star_awarded = False
+    st.session_state.puzzle_tries = 0
+    st.session_state.puzzle_star_awarded = False
+
+@timed()
+def ensure_daily_rotation():
+    today_str = date.today().isoformat()
+    lvl = int(st.session_state.level)
+
+    # Daily/weekly allowances owed since the last visit, posted in one go.
+    if game_engine().catch_up(date.today().toordinal()):
+        persist()
+
+    if st.session_state.last_day != today_str:
+        st.session_state.last_day = today_str
+        reset_daily_content_for_level(lvl)
+        return
+
+    if int(st.session_state.last_level_for_daily) != lvl:
+        reset_daily_content_for_level(lvl)
+
+def has_reward(name: str) -> bool:
+    return name in st.session_state.unlocked_rewards
+
+def unlock_reward(name: str):
+    st.session_state.unlocked_rewards.add(name)
+    if name == "Theme Badge":
+        st.session_state.unlocked_themes.update({"Ocean", "Sunset"})
+        if st.session_state.theme_name not in st.session_state.unlocked_themes:
+            st.session_state.theme_name = "Mint"
+    if name == "Sticker Pack 1":
+        st.session_state.sidebar_stickers.update({"⭐", "🌈", "🍀"})
+    if name == "Sticker Pack 2":
+        st.session_state.sidebar_stickers.update({"🚀", "🦄", "🍭"})
+    if name == "Super Saver Trophy":
+        st.session_state.has_trophy = True
+
+def game_engine():
+    return MissionEngine(st.session_state)
+
+def apply_subscriptions_charge_if_needed():
+    game_engine().charge_subscriptions()
+
+@timed()
+def apply_allowance_for_mission_if_needed():
+    game_engine().pay_allowance()
+
+@timed()
+def sync_allowance_change_in_current_mission():
+    game_engine().sync_allowance_change()
+
+@st.cache_resource
+def game_store():
+    return GameStore()
+
+@st.cache_resource(max_entries=32)
+def cohort_stats(prefix: str) -> CohortStats:
+    # One per class or district, shared by every session and refreshed incrementally.
+    return CohortStats(game_store(), prefix)
+
+def household_id() -> str:
+    return st.query_params.get("household", "default")
+
+def child_id() -> str:
+    return st.session_state.child_id
+
+@timed()
+def persist():
+    game_store().queue_save(profile_key(household_id(), child_id()), st.session_state)
+
+def persist_household():
+    game_store().queue_household(household_id(), st.session_state)
+
+def spend_label_with_icons(choice: str) -> str:
+    lower = choice.lower()
+    if "[need]" in lower:
+        return "need: " + choice
+    if "[want]" in lower:
+        return "want: " + choice
+    return "buy: " + choice
+
+# ============================================================
+# Session State
+# ============================================================
+def apply_child_state(state):
+    for key, value in state.items():
+        st.session_state[key] = value
+    st.session_state.coach_draft_loaded = False
+    st.session_state.play_step = "Mission"
+
+def init_state():
+    st.session_state.mode = "Parents"
+    st.session_state.parent_verified = False
+    apply_child_state(new_child_state())
+
+@timed()
+def load_or_init_state():
+    init_state()
+    household = household_id()
+    for key, value in (game_store().load_household(household) or new_household_state()).items():
+        st.session_state[key] = value
+
+    children = game_store().list_children(household)
+    child = st.query_params.get("child") or (sorted(children, key=child_sort_key)[0] if children else DEFAULT_CHILD)
+    st.session_state.child_id = child
+    st.session_state.child_switch = child
+    st.session_state.child_cache = {}
+
+    saved = game_store().load(profile_key(household, child))
+    if saved:
+        apply_child_state(saved)
+
+def child_sort_key(child: str):
+    return (0, int(child)) if child.isdigit() else (1, child)
+
+def known_children():
+    children = set(game_store().list_children(household_id()))
+    children.update(st.session_state.child_cache)
+    children.add(child_id())
+    return sorted(children, key=child_sort_key)
+
+def switch_child(child: str):
+    # Callback: runs before the script, so it may set the switcher's own state.
+    persist()
+    st.session_state.child_cache[child_id()] = stash_child(st.session_state)
+    state = st.session_state.child_cache.pop(child, None) or game_store().load(profile_key(household_id(), child))
+
+    apply_child_state(new_child_state())
+    if state:
+        apply_child_state(state)
+    st.session_state.child_id = child
+    st.session_state.child_switch = child
+    st.query_params["child"] = child
+    ensure_daily_rotation()
+    persist()
+
+def restore_child(stream) -> int:
+    # Replaces the current child's saved game with a backup file, then reloads it.
+    profile = profile_key(household_id(), child_id())
+    events = import_profile(game_store(), profile, stream)
+    apply_child_state(new_child_state())
+    apply_child_state(game_store().load(profile) or {})
+    ensure_daily_rotation()
+    persist()
+    return events
+
+def on_child_switch():
+    if st.session_state.child_switch != child_id():
+        switch_child(st.session_state.child_switch)
+
+def on_add_child():
+    switch_child(next_child_id(known_children()))
+
+# ============================================================
+# Styling
+# ============================================================
+@timed("styles")
+def inject_styles():
+    # Only bundles the browser has not seen yet are sent; usually nothing.
+    sent = st.session_state.setdefault("styles_sent", {})
+    bundles = stale_bundles(st.session_state.theme_name, sent)
+    if bundles:
+        html = loader_html(bundles)
+        st.html(html, unsafe_allow_javascript=True)
+        sent.update({b.slot: b.digest for b in bundles})
+        st.session_state.style_bytes_last_run = len(html.encode())
+    else:
+        st.session_state.style_bytes_last_run = 0
+
+# ============================================================
+# Panels
+# ============================================================
+def sidebar_figures() -> tuple:
+    # What the sidebar stat boxes show (see sidebar_stats in money_missions.py).
+    s = st.session_state
+    return (int(s.bank), int(s.wallet), int(s.stars), s.goal_name, int(s.goal_amount), int(s.level))
+
+def rerun_panel(full: bool = False):
+    # Fragment-scoped reruns only exist when the panel itself triggered the run;
+    # anything else (a full-app run, the app tester) falls back to a full rerun.
+    # A panel that changed what the sidebar shows (stars from a quiz or a buy)
+    # reruns the whole app so the sidebar is not left stale.
+    if not full and st.session_state.get("sidebar_shown") == sidebar_figures():
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            pass
+    st.rerun()
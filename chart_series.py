@@ -0,0 +1,94 @@
+"""Fixed-size chart series for the Progress page.
+
+The history gives three resolutions (recent missions, days, weeks). Whatever is
+picked is cut down to at most ``POINT_BUDGET`` points per series with
+Largest-Triangle-Three-Buckets, which keeps peaks and dips that plain striding
+would lose, so the chart payload does not grow with the number of missions.
+"""
+from dataclasses import dataclass
+from datetime import date
+from types import MappingProxyType
+
+import numpy as np
+
+from history_store import ColumnarHistory
+
+POINT_BUDGET = 120
+RESOLUTIONS = ("missions", "days", "weeks")
+
+
+def lttb(x, y, budget=POINT_BUDGET):
+    """Indices of at most ``budget`` points of ``(x, y)`` chosen by Largest-Triangle-Three-Buckets."""
+    n = len(x)
+    if n <= budget or budget < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # First and last points are always kept; the rest is split into budget - 2 buckets.
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    keep = np.empty(budget, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(hi, edges[i + 2]) if i + 2 < edges.size else slice(n - 1, n)
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+@dataclass(frozen=True, eq=False)
+class ProgressSeries:
+    history: ColumnarHistory
+    version: int
+    resolution: str
+    points: int  # rows before downsampling
+    bank: MappingProxyType  # x column plus "bank"
+    flows: MappingProxyType  # x column plus "saved" and "spent"
+    x: str
+
+
+def _rows(history, resolution):
+    if resolution == "missions":
+        ends = history.events("mission_end")
+        return "mission", ends["mission"], ends["bank"], ends["saved"], ends["spent"]
+    table = history.daily() if resolution == "days" else history.weekly()
+    # Rollups only keep the highest bank of a day or week.
+    return table.key, table.keys, table["max_bank"], table["saved"], table["spent"]
+
+
+def progress_series(history: ColumnarHistory, resolution: str, budget=POINT_BUDGET) -> ProgressSeries:
+    x_name, x, bank, saved, spent = _rows(history, resolution)
+    bank_idx = lttb(x, bank, budget)
+    # Saved and spent share one x axis: keep the points either series needs.
+    flow_idx = np.union1d(lttb(x, saved, budget), lttb(x, spent, budget))
+
+    def axis(idx):
+        if x_name == "mission":
+            return x[idx]
+        return [date.fromordinal(max(int(day), 1)) for day in x[idx]]
+
+    return ProgressSeries(
+        history=history,
+        version=history.version,
+        resolution=resolution,
+        points=len(x),
+        bank=MappingProxyType({x_name: axis(bank_idx), "bank": bank[bank_idx]}),
+        flows=MappingProxyType({x_name: axis(flow_idx), "saved": saved[flow_idx], "spent": spent[flow_idx]}),
+        x=x_name,
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    for n in (100, 10_000, 1_000_000):
+        x = np.arange(n)
+        y = np.cumsum(rng.integers(-3, 5, n))
+        t0 = time.perf_counter()
+        idx = lttb(x, y)
+        t1 = time.perf_counter()
+        print(f"{n:>9} points -> {idx.size} in {(t1 - t0) * 1000:.2f} ms (max kept {y[idx].max()} of {y.max()})")
@@ -0,0 +1,225 @@
+"""Class and district figures over many children's saved games.
+
+A class is one household (its children are ``household/child`` profiles); a
+district is every household whose code starts with the same prefix. Each
+child is reduced to one column of ``CHILD_COLUMNS``, read straight from the
+stored state and history chunks, and the per-level figures are vectorized
+group-bys over those columns. :meth:`CohortStats.refresh` only re-reads the
+children whose saved game changed since the last call.
+"""
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
+
+from content import LEVEL_UNLOCK_STARS
+from persistence import parse_state
+
+CHILD_COLUMNS = (
+    "level",
+    "stars",
+    "streak",
+    "best_streak",
+    "missions",
+    "goal_met",
+    "saved",
+    "spent",
+    "allowance",
+    "questions",
+    "questions_right",  # practised questions answered right last time
+)
+_COL = {name: i for i, name in enumerate(CHILD_COLUMNS)}
+_FLOWS = ("allowance_paid", "allowance_adjust", "allowance_accrued")
+MAX_LEVEL = max(LEVEL_UNLOCK_STARS)
+
+
+def _unlock_thresholds():
+    # Stars needed for the level above each level (unreachable at the top), indexable by level.
+    stars = np.full(MAX_LEVEL + 2, np.iinfo(np.int64).max, dtype=np.int64)
+    for level, needed in LEVEL_UNLOCK_STARS.items():
+        stars[level - 1] = needed
+    return stars
+
+
+_NEXT_LEVEL_STARS = _unlock_thresholds()
+
+
+def _reduce_children(rows):
+    """Columns for ``[(state JSON, chunk rows), ...]``: one column per child."""
+    data = np.zeros((len(CHILD_COLUMNS), len(rows)), dtype=np.int64)
+    ends, flows = [], []  # (child, columns, block), reduced together below
+    for i, (state_text, chunks) in enumerate(rows):
+        state = parse_state(state_text)
+        data[_COL["level"], i] = int(state.get("level", 1))
+        data[_COL["stars"], i] = int(state.get("stars", 0))
+        data[_COL["streak"], i] = int(state.get("streak", 0))
+        cards = state.get("review_cards") or {}
+        data[_COL["questions"], i] = len(cards)
+        data[_COL["questions_right"], i] = sum(1 for card in cards.values() if card[3] > 0)
+        for event, columns, _, blob in chunks:
+            if event == "mission_end" or event in _FLOWS:
+                columns = columns.split(",")
+                block = np.frombuffer(blob, dtype=np.int64).reshape(len(columns), -1)
+                (ends if event == "mission_end" else flows).append((i, columns, block))
+
+    if ends:
+        child = np.concatenate([np.full(block.shape[1], i) for i, _, block in ends])
+        saved = np.concatenate([block[columns.index("saved")] for _, columns, block in ends])
+        spent = np.concatenate([block[columns.index("spent")] for _, columns, block in ends])
+        streak = np.concatenate([block[columns.index("streak")] for _, columns, block in ends])
+        n = len(rows)
+        data[_COL["missions"]] = np.bincount(child, minlength=n)
+        data[_COL["goal_met"]] = np.bincount(child, weights=streak > 0, minlength=n)
+        data[_COL["saved"]] = np.bincount(child, weights=saved, minlength=n)
+        data[_COL["spent"]] = np.bincount(child, weights=spent, minlength=n)
+        np.maximum.at(data[_COL["best_streak"]], child, streak)
+    if flows:
+        child = np.concatenate([np.full(block.shape[1], i) for i, _, block in flows])
+        amount = np.concatenate([block[columns.index("amount")] for _, columns, block in flows])
+        data[_COL["allowance"]] = np.bincount(child, weights=amount, minlength=len(rows))
+    return data
+
+
+@dataclass(frozen=True, eq=False)
+class CohortSummary:
+    version: int
+    children: int
+    by_level: MappingProxyType  # "level" plus per-level arrays (see CohortStats.summary)
+    ready: tuple  # profiles with enough stars for the next level
+
+
+class CohortStats:
+    """Per-child columns for one class or district, kept up to date incrementally."""
+
+    def __init__(self, store, prefix):
+        self.store = store
+        self.prefix = prefix
+        self.profiles = []
+        self.data = np.zeros((len(CHILD_COLUMNS), 0), dtype=np.int64)
+        self.version = 0
+        self._row = {}
+        self._updated = {}
+        self._summary = None
+        self._lock = threading.Lock()
+
+    def column(self, name):
+        return self.data[_COL[name]]
+
+    def refresh(self):
+        """Re-read children saved since the last refresh and drop deleted ones; returns how many changed."""
+        with self._lock:
+            current = self.store.profile_versions(self.prefix)
+            gone = [p for p in self._row if p not in current]
+            changed = [p for p, updated in current.items() if self._updated.get(p) != updated]
+            if gone:
+                keep = np.ones(len(self.profiles), dtype=bool)
+                keep[[self._row[p] for p in gone]] = False
+                self.profiles = [p for p, k in zip(self.profiles, keep) if k]
+                self.data = self.data[:, keep]
+                self._row = {p: i for i, p in enumerate(self.profiles)}
+                for p in gone:
+                    del self._updated[p]
+            if changed:
+                loaded = list(self.store.iter_many(changed))
+                new = [p for p, _, _ in loaded if p not in self._row]
+                self._row.update((p, len(self.profiles) + k) for k, p in enumerate(new))
+                self.profiles.extend(new)
+                self.data = np.hstack([self.data, np.zeros((len(CHILD_COLUMNS), len(new)), dtype=np.int64)])
+                rows = [self._row[p] for p, _, _ in loaded]
+                self.data[:, rows] = _reduce_children([(state, chunks) for _, state, chunks in loaded])
+                for p, _, _ in loaded:
+                    self._updated[p] = current[p]
+            if gone or changed:
+                self.version += 1
+            return len(gone) + len(changed)
+
+    def summary(self) -> CohortSummary:
+        """Per-level figures; recomputed only when a refresh changed something."""
+        summary = self._summary
+        if summary is not None and summary.version == self.version:
+            return summary
+        level = self.column("level")
+        levels, group = np.unique(level, return_inverse=True)
+
+        def total(values):
+            return np.bincount(group, weights=values, minlength=levels.size)
+
+        def ratio(num, den):
+            return np.divide(num, den, out=np.zeros(levels.size), where=den > 0)
+
+        children = np.bincount(group, minlength=levels.size)
+        allowance = self.column("allowance")
+        paid = allowance > 0
+        save_rate = np.divide(self.column("saved"), allowance, out=np.zeros(allowance.size), where=paid)
+        ready = self.column("stars") >= _NEXT_LEVEL_STARS[np.clip(level, 0, MAX_LEVEL + 1)]
+        by_level = {
+            "level": levels,
+            "children": children,
+            # Mean of each child's own rate, over children who were paid an allowance.
+            "save_rate": ratio(total(save_rate), total(paid)),
+            "goal_rate": ratio(total(self.column("goal_met")), total(self.column("missions"))),
+            "missions": ratio(total(self.column("missions")), children),
+            "stars": ratio(total(self.column("stars")), children),
+            "streak": ratio(total(self.column("streak")), children),
+            "best_streak": ratio(total(self.column("best_streak")), children),
+            "quiz_accuracy": ratio(total(self.column("questions_right")), total(self.column("questions"))),
+            "ready": total(ready).astype(np.int64),
+        }
+        self._summary = CohortSummary(
+            version=self.version,
+            children=len(self.profiles),
+            by_level=MappingProxyType(by_level),
+            ready=tuple(p for p, r in zip(self.profiles, ready) if r),
+        )
+        return self._summary
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+    import time
+
+    from history_store import ColumnarHistory
+    from persistence import GameStore
+    from profiles import new_child_state
+
+    children = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    missions = 30
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = GameStore(os.path.join(tmp, "cohort.db"))
+        for c in range(children):
+            state = new_child_state()
+            state["level"] = int(rng.integers(1, 7))
+            state["stars"] = int(rng.integers(0, 80))
+            history = ColumnarHistory()
+            for m in range(1, missions + 1):
+                history.append({"mission": m, "event": "allowance_paid", "amount": 10})
+                saved = int(rng.integers(0, 8))
+                history.append({"mission": m, "event": "mission_end", "saved": saved, "spent": 2, "streak": saved // 3})
+            state["history"] = history
+            store.queue_save(f"district-{c // 30}/{c % 30 + 1}", state)
+        store.flush()
+
+        stats = CohortStats(store, "district-")
+        t0 = time.perf_counter()
+        stats.refresh()
+        summary = stats.summary()
+        t1 = time.perf_counter()
+        print(f"{summary.children} children, {children * missions * 2} events: first load {t1 - t0:.2f} s")
+        for c in range(25):
+            store.queue_save(f"district-{c}/1", dict(new_child_state(), level=2, stars=50, history=ColumnarHistory()))
+        store.flush()
+        t0 = time.perf_counter()
+        changed = stats.refresh()
+        summary = stats.summary()
+        t1 = time.perf_counter()
+        print(f"refresh after {changed} children played: {(t1 - t0) * 1000:.0f} ms")
+        for i, level in enumerate(summary.by_level["level"]):
+            print(
+                f"level {level}: {summary.by_level['children'][i]} children, "
+                f"save rate {summary.by_level['save_rate'][i]:.0%}, goals {summary.by_level['goal_rate'][i]:.0%}, "
+                f"{summary.by_level['ready'][i]} ready"
+            )
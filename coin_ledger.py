@@ -0,0 +1,102 @@
+"""Every coin movement of a child's game as an append-only ledger.
+
+The ledger lives in the history: each movement is a ``coins`` event numbered
+by ``entry``, and every ``SNAPSHOT_EVERY`` entries a ``coin_snapshot`` records
+both balances (entry 0 is the opening balance). The balances after any entry
+are the snapshot before it plus at most ``SNAPSHOT_EVERY`` entries, so they
+can be restored without summing the whole ledger, and :func:`audit` checks
+that the snapshots and the entries between them agree.
+"""
+import numpy as np
+
+ACCOUNTS = ("wallet", "bank")
+REASONS = (
+    "allowance",
+    "allowance_adjust",
+    "subscription",
+    "saved",
+    "spent",
+    "growth_stake",
+    "growth_return",
+    "surprise",
+    "goal",
+)
+SNAPSHOT_EVERY = 64
+
+_ACCOUNT = {name: i for i, name in enumerate(ACCOUNTS)}
+_REASON = {name: i for i, name in enumerate(REASONS)}
+
+
+class LedgerError(ValueError):
+    pass
+
+
+def entry_values(mission, entry, account, delta, reason) -> tuple:
+    # A ``coins`` row in EVENT_COLUMNS order, for ColumnarHistory.append_values.
+    return int(mission), int(entry), _ACCOUNT[account], int(delta), _REASON[reason]
+
+
+def snapshot_values(mission, entry, wallet, bank) -> tuple:
+    return int(mission), int(entry), int(wallet), int(bank)
+
+
+def snapshot_row(mission, entry, wallet, bank) -> dict:
+    return {"mission": int(mission), "event": "coin_snapshot", "entry": int(entry), "wallet": int(wallet), "bank": int(bank)}
+
+
+def balances(history, entry=None):
+    """``(wallet, bank)`` after ledger entry ``entry`` (default: the latest one)."""
+    snaps = history.events("coin_snapshot")
+    coins = history.events("coins")
+    if not len(snaps):
+        raise LedgerError("this history has no coin snapshot to start from")
+    if entry is None:
+        entry = max(int(snaps["entry"][-1]), int(coins["entry"][-1]) if len(coins) else 0)
+    k = int(np.searchsorted(snaps["entry"], entry, side="right")) - 1
+    if k < 0:
+        raise LedgerError(f"entry {entry} is older than the history still held")
+    start = int(snaps["entry"][k])
+    lo, hi = np.searchsorted(coins["entry"], [start, entry], side="right")
+    if entry > start and (hi - lo != entry - start):
+        raise LedgerError(f"ledger entries {start + 1}..{entry} are incomplete")
+    tail = np.bincount(coins["account"][lo:hi], weights=coins["delta"][lo:hi], minlength=len(ACCOUNTS))
+    return int(snaps["wallet"][k] + tail[0]), int(snaps["bank"][k] + tail[1])
+
+
+def audit(history):
+    """Entry numbers of snapshots that do not match the snapshot before them plus the entries between."""
+    snaps = history.events("coin_snapshot")
+    coins = history.events("coins")
+    if len(snaps) < 2:
+        return []
+    # Running totals per account, indexed by how many entries are held up to each snapshot.
+    running = np.zeros((len(ACCOUNTS), len(coins) + 1), dtype=np.int64)
+    for i in range(len(ACCOUNTS)):
+        np.cumsum(np.where(coins["account"] == i, coins["delta"], 0), out=running[i, 1:])
+    at = np.searchsorted(coins["entry"], snaps["entry"], side="right")
+    moved = np.diff(running[:, at], axis=1)
+    bad = (snaps["wallet"][1:] != snaps["wallet"][:-1] + moved[0]) | (snaps["bank"][1:] != snaps["bank"][:-1] + moved[1])
+    return snaps["entry"][1:][bad].tolist()
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from mission_engine import GameState, MissionEngine
+
+    state = GameState(level=6, active_subscriptions={"Music app (2 coins/mission)"})
+    engine = MissionEngine(state, random.Random(7))
+    for _ in range(2000):
+        engine.pay_allowance()
+        engine.finish_mission(int(state.wallet) // 2, 1, growth_test=True)
+        state.history.take_unsaved()
+    last = int(state.ledger_entries)
+    n = 1000
+    t0 = time.perf_counter()
+    for i in range(n):
+        balances(state.history, last - i % 200)
+    t1 = time.perf_counter()
+    print(f"{last} entries ({len(state.history.events('coins'))} held), balances at any held entry: "
+          f"{(t1 - t0) / n * 1e6:.1f} us; now {balances(state.history)} vs wallet {state.wallet} bank {state.bank}; "
+          f"audit: {audit(state.history) or 'ok'}")
@@ -0,0 +1,149 @@
+"""Static game content for Money Missions: themes, goals, spend options and shop items.
+
+Everything here is loaded once per process and shared read-only by every session.
+"""
+from types import MappingProxyType
+
+# ============================================================
+# Themes (Unlocked by rewards)
+# ============================================================
+THEMES = {
+    "Mint": {
+        "bg": "linear-gradient(135deg, #eafff5 0%, #fffbe6 55%, #eaf2ff 100%)",
+        "card_border": "rgba(16,185,129,0.18)",
+        "side_border": "rgba(234,179,8,0.25)",
+        "pill_bg": "rgba(234,179,8,0.18)",
+        "pill_border": "rgba(234,179,8,0.35)",
+    },
+    "Ocean": {
+        "bg": "linear-gradient(135deg, #e8f7ff 0%, #eafff5 60%, #fffbe6 100%)",
+        "card_border": "rgba(59,130,246,0.18)",
+        "side_border": "rgba(234,179,8,0.25)",
+        "pill_bg": "rgba(59,130,246,0.12)",
+        "pill_border": "rgba(59,130,246,0.25)",
+    },
+    "Sunset": {
+        "bg": "linear-gradient(135deg, #fff1f2 0%, #fffbe6 55%, #eaf2ff 100%)",
+        "card_border": "rgba(244,63,94,0.16)",
+        "side_border": "rgba(234,179,8,0.25)",
+        "pill_bg": "rgba(244,63,94,0.10)",
+        "pill_border": "rgba(244,63,94,0.22)",
+    },
+}
+
+# ============================================================
+# Spend Options (Progressively more realistic by level)
+# ============================================================
+SPEND_OPTIONS_BY_LEVEL = {
+    1: {
+        "I buy nothing (0)": 0,
+        "A small snack (2)": 2,
+        "A sweet treat (3)": 3,
+        "A small toy sticker (4)": 4,
+    },
+    2: {
+        "I buy nothing (0)": 0,
+        "A small snack (3)": 3,
+        "A sweet treat (5)": 5,
+        "A mini game item (6)": 6,
+        "School supplies (4)": 4,
+    },
+    3: {
+        "I buy nothing (0)": 0,
+        "Candy (5) [want]": 5,
+        "Game item (8) [want]": 8,
+        "School supplies (6) [need]": 6,
+        "Bus fare / ride (6) [need]": 6,
+        "Healthy snack (4) [need]": 4,
+    },
+    4: {
+        "I buy nothing (0)": 0,
+        "Snack (4)": 4,
+        "Movie night (10)": 10,
+        "School supplies (7)": 7,
+        "Gift (8)": 8,
+    },
+    5: {
+        "I buy nothing (0)": 0,
+        "Snack (4)": 4,
+        "Game item (10)": 10,
+        "Movie night (12)": 12,
+        "School supplies (8)": 8,
+    },
+    6: {
+        "I buy nothing (0)": 0,
+        "Snack (4)": 4,
+        "Game item (10)": 10,
+        "Movie night (12)": 12,
+        "School supplies (8)": 8,
+    },
+}
+
+SHOP_ITEMS = [
+    ("Sticker Pack 1", 5),
+    ("Sticker Pack 2", 8),
+    ("Theme Badge", 10),
+    ("Super Saver Trophy", 15),
+]
+
+# ============================================================
+# Learning Path (levels, quizzes and puzzles live in packs/, see content_packs)
+# ============================================================
+LEVEL_UNLOCK_STARS = {1: 0, 2: 10, 3: 25, 4: 45, 5: 70, 6: 100}
+
+GOALS_BY_LEVEL = {
+    1: [("Small toy", 30), ("Book", 35), ("Sticker mega pack", 40)],
+    2: [("Bigger toy", 50), ("Art set", 55), ("Puzzle box", 60)],
+    3: [("New game", 70), ("Sports gear", 80), ("Board game", 85)],
+    4: [("Headphones", 100), ("School bag", 90), ("Cool hoodie", 110)],
+    5: [("Bike fund", 160), ("Tablet fund", 180), ("Camera fund", 200)],
+    6: [("Laptop fund", 240), ("Big goal", 300), ("Dream goal", 360)],
+}
+
+SURPRISE_EVENTS = [
+    ("Your pencil broke. You need a new one.", -2),
+    ("You lost an eraser. Replace it.", -1),
+    ("You forgot a notebook. Buy a cheap one.", -3),
+    ("Your friend’s birthday. You buy a small card.", -2),
+]
+
+SUBSCRIPTIONS = {
+    "Music app (2 coins/mission)": 2,
+    "Game pass (3 coins/mission)": 3,
+    "Video app (2 coins/mission)": 2,
+}
+
+# Growth Lab: (typical growth in a year %, how much a year swings %), roughly a
+# savings account, a mix of savings and shares, and shares alone.
+GROWTH_PROFILES = {
+    "safe": (2, 0.5),
+    "medium": (5, 8),
+    "risky": (8, 18),
+}
+
+PARENT_REFLECTION = [
+    "Spending too much",
+    "Forgetting the goal",
+    "Mixing up needs and wants",
+    "Not saving first",
+    "Doing great (keep going)",
+]
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+THEMES = _freeze(THEMES)
+SPEND_OPTIONS_BY_LEVEL = _freeze(SPEND_OPTIONS_BY_LEVEL)
+SHOP_ITEMS = _freeze(SHOP_ITEMS)
+LEVEL_UNLOCK_STARS = _freeze(LEVEL_UNLOCK_STARS)
+GOALS_BY_LEVEL = _freeze(GOALS_BY_LEVEL)
+SURPRISE_EVENTS = _freeze(SURPRISE_EVENTS)
+SUBSCRIPTIONS = _freeze(SUBSCRIPTIONS)
+PARENT_REFLECTION = _freeze(PARENT_REFLECTION)
+GROWTH_PROFILES = _freeze(GROWTH_PROFILES)
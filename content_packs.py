@@ -0,0 +1,327 @@
+"""Level, quiz, puzzle and star reward content loaded from versioned JSON packs.
+
+Every ``*.json`` file in the pack directory is validated and compiled once into
+a read-only :class:`ContentIndex` shared by all sessions. Packs are merged in
+file-name order: a later pack may add questions to a level or replace its
+texts and goal rule, and may add star rules or replace them by id. The index
+is rebuilt only when a pack file's mtime (or the set of files) changes.
+"""
+import ast
+import json
+import os
+import threading
+import traceback
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+PACK_DIR = os.environ.get("MONEY_MISSIONS_PACKS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "packs"))
+PACK_FORMAT = 1
+KINDS = ("quiz", "puzzle")
+LEVEL_FIELDS = ("name", "grade_band", "concept", "mission_goal_text", "mission_goal")
+ITEM_FIELDS = ("id", "q", "choices", "answer", "tip")
+RULE_NAMES = ("saved", "spent", "allowance")
+# Star rules also see the level and whether the level's goal rule was met.
+STAR_RULE_NAMES = RULE_NAMES + ("level", "goal")
+STAR_RULE_FIELDS = ("id", "when", "stars", "why")
+
+
+class PackError(ValueError):
+    pass
+
+
+# ============================================================
+# Rules
+# ============================================================
+_COMPARE_OPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+_ARITH_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod)
+
+
+class _Vectorize(ast.NodeTransformer):
+    """Validate a rule and rewrite it so it works on scalars and NumPy arrays alike.
+
+    ``and``/``or`` become ``&``/``|`` over operands made 0/1 (``x`` becomes ``x != 0``
+    unless it is already a comparison), ``not x`` becomes ``x == 0`` and chained
+    comparisons are split, since the boolean keywords only work on scalars.
+    """
+
+    def __init__(self, source, names):
+        self.source = source
+        self.names = names
+
+    def fail(self, node, what):
+        raise PackError(f"rule {self.source!r}: {what} is not allowed")
+
+    def generic_visit(self, node):
+        self.fail(node, type(node).__name__)
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Name(self, node):
+        if node.id not in self.names:
+            self.fail(node, f"name {node.id!r}")
+        return node
+
+    def visit_Constant(self, node):
+        if type(node.value) not in (int, float):
+            self.fail(node, f"constant {node.value!r}")
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _ARITH_OPS):
+            self.fail(node, type(node.op).__name__)
+        return ast.BinOp(self.visit(node.left), node.op, self.visit(node.right))
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            # ``~`` on a Python bool is an int (~True == -2), so compare instead.
+            return ast.Compare(self.visit(node.operand), [ast.Eq()], [ast.Constant(0)])
+        if isinstance(node.op, ast.USub):
+            return ast.UnaryOp(node.op, self.visit(node.operand))
+        self.fail(node, type(node.op).__name__)
+
+    def visit_BoolOp(self, node):
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        values = [self.visit(v) if self._is_test(v) else self._truth(self.visit(v)) for v in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = ast.BinOp(result, op, value)
+        return result
+
+    @staticmethod
+    def _is_test(node):
+        # Already 0/1 once rewritten, so ``&``/``|`` on it means ``and``/``or``.
+        return isinstance(node, (ast.Compare, ast.BoolOp)) or (isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not))
+
+    @staticmethod
+    def _truth(node):
+        # ``saved and spent`` as ``saved & spent`` would be 0 for 2 and 1.
+        return ast.Compare(node, [ast.NotEq()], [ast.Constant(0)])
+
+    def visit_Compare(self, node):
+        if not all(isinstance(op, _COMPARE_OPS) for op in node.ops):
+            self.fail(node, "that comparison")
+        operands = [self.visit(node.left)] + [self.visit(c) for c in node.comparators]
+        parts = [ast.Compare(operands[i], [op], [operands[i + 1]]) for i, op in enumerate(node.ops)]
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(result, ast.BitAnd(), part)
+        return result
+
+
+class GoalRule:
+    """A compiled rule such as ``saved >= 5 and spent <= 6``, called with values for its names."""
+
+    __slots__ = ("source", "_fn")
+
+    def __init__(self, source, fn):
+        self.source = source
+        self._fn = fn
+
+    def __call__(self, *values):
+        return self._fn(*values)
+
+    def __repr__(self):
+        return f"GoalRule({self.source!r})"
+
+
+@lru_cache(maxsize=None)
+def compile_rule(source: str, names=RULE_NAMES) -> GoalRule:
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise PackError(f"rule {source!r}: {exc.msg}") from None
+    body = _Vectorize(source, names).visit(tree).body
+    fn = ast.Expression(
+        ast.Lambda(
+            ast.arguments(posonlyargs=[], args=[ast.arg(n) for n in names], kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body,
+        )
+    )
+    code = compile(ast.fix_missing_locations(fn), f"<rule {source!r}>", "eval")
+    return GoalRule(source, eval(code, {"__builtins__": {}}))
+
+
+@dataclass(frozen=True)
+class StarRule:
+    id: str
+    when: GoalRule  # over STAR_RULE_NAMES
+    stars: int
+    why: str  # shown to the child when the rule pays out
+
+
+# ============================================================
+# Packs
+# ============================================================
+@dataclass(frozen=True, eq=False)
+class ContentIndex:
+    levels: MappingProxyType  # level -> level info with "quiz_pool"/"puzzle_pool" tuples
+    items: MappingProxyType  # item id -> item
+    item_levels: MappingProxyType  # item id -> (level, kind)
+    versions: MappingProxyType  # pack name -> version
+    star_rules: tuple  # StarRule, applied to every finished mission
+    star_awards: MappingProxyType  # "quiz", "puzzle", "goal_bought" -> stars
+
+    def item(self, item_id):
+        return self.items.get(item_id)
+
+
+def _check_item(pack, level, kind, item):
+    # Hot path for large banks: the error text is only built when something is wrong.
+    try:
+        choices = tuple(item["choices"])
+        clean = {"id": str(item["id"]), "q": item["q"], "choices": choices, "answer": item["answer"], "tip": item["tip"]}
+    except (KeyError, TypeError):
+        got = sorted(item) if isinstance(item, dict) else type(item).__name__
+        raise PackError(f"pack {pack!r} level {level} {kind}: items need {', '.join(ITEM_FIELDS)}, got {got}") from None
+    if (
+        type(item["choices"]) is not list
+        or len(choices) < 2
+        or {type(c) for c in choices} != {str}
+        or clean["answer"] not in choices
+    ):
+        raise PackError(
+            f"pack {pack!r} level {level} {kind} item {clean['id']!r}: "
+            "choices must be two or more strings and include the answer"
+        )
+    return MappingProxyType(clean)
+
+
+def _check_star_rule(pack, raw):
+    try:
+        rule = StarRule(
+            id=str(raw["id"]),
+            when=compile_rule(str(raw["when"]), STAR_RULE_NAMES),
+            stars=raw["stars"],
+            why=str(raw["why"]),
+        )
+    except (KeyError, TypeError):
+        got = sorted(raw) if isinstance(raw, dict) else type(raw).__name__
+        raise PackError(f"pack {pack!r} star rule: needs {', '.join(STAR_RULE_FIELDS)}, got {got}") from None
+    if type(rule.stars) is not int:
+        raise PackError(f"pack {pack!r} star rule {rule.id!r}: stars must be a whole number")
+    return rule
+
+
+def build_index(packs) -> ContentIndex:
+    """Validate and merge ``[(file name, parsed JSON), ...]`` into one index."""
+    levels, items, item_levels, versions = {}, {}, {}, {}
+    star_rules, star_awards = {}, {}
+    for name, pack in packs:
+        if not isinstance(pack, dict) or pack.get("format") != PACK_FORMAT:
+            raise PackError(f"{name}: expected a pack object with \"format\": {PACK_FORMAT}")
+        pack_name = str(pack.get("pack") or os.path.splitext(name)[0])
+        versions[pack_name] = str(pack.get("version", "0"))
+        for key, spec in (pack.get("levels") or {}).items():
+            try:
+                level = int(key)
+            except ValueError:
+                raise PackError(f"pack {pack_name!r}: level {key!r} is not a number") from None
+            info = levels.setdefault(level, {"quiz_pool": [], "puzzle_pool": []})
+            for field in LEVEL_FIELDS:
+                if field in spec:
+                    info[field] = str(spec[field])
+            for kind in KINDS:
+                for raw in spec.get(kind, ()):
+                    item = _check_item(pack_name, level, kind, raw)
+                    if item["id"] in items:
+                        raise PackError(f"pack {pack_name!r}: duplicate item id {item['id']!r}")
+                    items[item["id"]] = item
+                    item_levels[item["id"]] = (level, kind)
+                    info[f"{kind}_pool"].append(item)
+        for raw in pack.get("star_rules", ()):
+            rule = _check_star_rule(pack_name, raw)
+            star_rules[rule.id] = rule
+        for key, stars in (pack.get("star_awards") or {}).items():
+            if type(stars) is not int:
+                raise PackError(f"pack {pack_name!r}: star award {key!r} must be a whole number")
+            star_awards[str(key)] = stars
+
+    for level, info in levels.items():
+        missing = [f for f in LEVEL_FIELDS if f not in info]
+        if missing:
+            raise PackError(f"level {level}: missing {', '.join(missing)}")
+        for kind in KINDS:
+            if not info[f"{kind}_pool"]:
+                raise PackError(f"level {level}: no {kind} items")
+            info[f"{kind}_pool"] = tuple(info[f"{kind}_pool"])
+        info["mission_goal_fn"] = compile_rule(info["mission_goal"])
+
+    return ContentIndex(
+        levels=MappingProxyType({level: MappingProxyType(levels[level]) for level in sorted(levels)}),
+        items=MappingProxyType(items),
+        item_levels=MappingProxyType(item_levels),
+        versions=MappingProxyType(versions),
+        star_rules=tuple(star_rules.values()),
+        star_awards=MappingProxyType(star_awards),
+    )
+
+
+def _pack_files(directory):
+    return sorted(
+        (entry.name, entry.stat().st_mtime_ns)
+        for entry in os.scandir(directory)
+        if entry.name.endswith(".json") and entry.is_file()
+    )
+
+
+def load_index(directory=PACK_DIR) -> ContentIndex:
+    packs = []
+    for name, _ in _pack_files(directory):
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            try:
+                packs.append((name, json.load(f)))
+            except json.JSONDecodeError as exc:
+                raise PackError(f"{name}: {exc}") from None
+    if not packs:
+        raise PackError(f"no content packs in {directory}")
+    return build_index(packs)
+
+
+class PackLoader:
+    """Serves the compiled index, recompiling only when the pack files change."""
+
+    def __init__(self, directory=PACK_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._files = None
+        self._index = None
+
+    def current(self) -> ContentIndex:
+        files = _pack_files(self.directory)
+        if files == self._files:
+            return self._index
+        with self._lock:
+            if files != self._files:
+                try:
+                    self._index = load_index(self.directory)
+                except PackError:
+                    # A broken edit keeps the last good content live.
+                    if self._index is None:
+                        raise
+                    traceback.print_exc()
+                self._files = files
+        return self._index
+
+
+_LOADER = PackLoader()
+
+
+def content_index() -> ContentIndex:
+    return _LOADER.current()
+
+
+def levels():
+    return content_index().levels
+
+
+if __name__ == "__main__":
+    index = content_index()
+    print(f"{len(index.levels)} levels, {len(index.items)} items from packs {dict(index.versions)}")
+    for level, info in index.levels.items():
+        print(f"level {level}: goal {info['mission_goal_fn']!r}, {len(info['quiz_pool'])} quiz, {len(info['puzzle_pool'])} puzzle")
+    for rule in index.star_rules:
+        print(f"+{rule.stars} {rule.id}: {rule.when.source}")
+    print(f"awards {dict(index.star_awards)}")
@@ -0,0 +1,173 @@
+"""How many more missions until each goal, from the child's own recent play.
+
+A forecast runs ``PATHS`` possible futures at once as NumPy lanes. Each mission
+a lane gets the allowance and pays repeat costs (from the first mission not yet
+paid, as ``pay_allowance`` would), then saves and spends a
+``(saved, spent)`` pair drawn from the child's recent missions (so habits that
+go together stay together), runs a level-6 growth test as often as the child
+does, and may meet a surprise. The median and the 10th-90th percentile of the
+missions until the piggy bank covers a goal give "about 6 missions (4-9)".
+"""
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from content import GOALS_BY_LEVEL, SURPRISE_EVENTS
+from mission_engine import GROWTH_TEST_RETURNS, GROWTH_TEST_STAKE, SURPRISE_CHANCE, MissionEngine, subscription_mask
+from simulator import NOT_REACHED, take_coins
+
+PATHS = 2000
+HORIZON = 200  # missions looked ahead; goals further away show as "more than HORIZON"
+RECENT_MISSIONS = 30
+MIN_MISSIONS = 3  # fewer recent missions than this: assume half the allowance is saved
+
+
+@dataclass(frozen=True)
+class GoalEstimate:
+    name: str
+    amount: int
+    median: Optional[int]  # missions from now; None when beyond HORIZON
+    low: Optional[int]  # 10th percentile
+    high: Optional[int]  # 90th percentile
+    reached: float  # share of futures that get there within HORIZON
+
+    def describe(self):
+        if self.median == 0:
+            return "you can buy it now"
+        if self.median is None:
+            return f"more than {HORIZON} missions away at this pace"
+        if self.low == self.high:
+            return f"about {self.median} more missions"
+        band = f"{self.low}-{self.high}" if self.high is not None else f"{self.low} or more"
+        return f"about {self.median} more missions ({band})"
+
+
+@dataclass(frozen=True, eq=False)
+class GoalForecast:
+    key: tuple
+    goals: tuple  # GoalEstimate, the current goal first
+    missions_used: int  # recent missions the habits came from (0: the half-the-allowance guess)
+
+
+def forecast_key(state) -> tuple:
+    """What a forecast depends on: the futures start from both balances. Quiz stars leave it alone."""
+    return (
+        id(state.history),
+        int(state.mission),
+        int(state.wallet),
+        int(state.bank),
+        bool(state.mission_paid),
+        int(state.level),
+        int(state.allowance),
+        state.allowance_schedule,
+        subscription_mask(state.active_subscriptions),
+        state.goal_name,
+        int(state.goal_amount),
+    )
+
+
+def _per_mission(history, event, first_mission, missions):
+    t = history.events(event)
+    recent = t["mission"] >= first_mission
+    return int(round(abs(int(t["amount"][recent].sum())) / missions)) if missions else 0
+
+
+def _habits(state):
+    """``(saved, spent, growth test rate, income, repeat costs, missions used)`` from recent play."""
+    ends = state.history.events("mission_end")
+    n = min(ends.size, RECENT_MISSIONS)
+    allowance = int(state.allowance)
+    repeat = MissionEngine(state).subscription_cost()
+    if n < MIN_MISSIONS:
+        return np.array([allowance // 2]), np.array([0]), 0.0, allowance, repeat, 0
+    saved, spent = ends["saved"][-n:], ends["spent"][-n:]
+    growth = float(ends["growth_test"][-n:].mean()) if int(state.level) >= 6 else 0.0
+    if state.allowance_schedule != "mission":
+        # Paid by the calendar: what actually came in and went out per recent mission.
+        first = int(ends["mission"][-n])
+        allowance = _per_mission(state.history, "allowance_accrued", first, n)
+        repeat = _per_mission(state.history, "subscription_charge", first, n)
+    return saved, spent, growth, allowance, repeat, n
+
+
+def forecast_goals(state, paths=PATHS, horizon=HORIZON) -> GoalForecast:
+    key = forecast_key(state)
+    level = int(state.level)
+    goals = [(state.goal_name, int(state.goal_amount))]
+    goals += [g for g in GOALS_BY_LEVEL.get(level, GOALS_BY_LEVEL[1]) if g[0] != state.goal_name]
+    amounts = np.array([amount for _, amount in goals], dtype=np.int64)
+    saved_habit, spent_habit, growth_rate, income, repeat, used = _habits(state)
+    # The current mission's allowance may already be in the wallet; it is not paid twice.
+    paid_from = 1 if MissionEngine(state).allowance_due() else 2
+
+    # Seeded from the key: the same inputs always give the same forecast, and the
+    # child's own random stream is left alone.
+    rng = np.random.default_rng(zlib.crc32(repr(key[1:]).encode()))
+    surprise_costs = np.array([-delta for _, delta in SURPRISE_EVENTS], dtype=np.int64)
+    growth_returns = np.array(GROWTH_TEST_RETURNS, dtype=np.int64)
+    wallet = np.full(paths, int(state.wallet), dtype=np.int64)
+    bank = np.full(paths, int(state.bank), dtype=np.int64)
+    to_goal = np.where(bank[None, :] >= amounts[:, None], 0, NOT_REACHED)
+
+    for m in range(1, horizon + 1):
+        if not (to_goal == NOT_REACHED).any():
+            break
+        if m >= paid_from:
+            wallet += income
+            if repeat:
+                take_coins(wallet, bank, repeat)
+        pick = rng.integers(0, saved_habit.size, paths)
+        saved = np.minimum(saved_habit[pick], wallet)
+        spent = np.minimum(spent_habit[pick], wallet - saved)
+        wallet -= saved + spent
+        bank += saved
+        if growth_rate > 0:
+            grow = (rng.random(paths) < growth_rate) & (wallet >= GROWTH_TEST_STAKE)
+            wallet += np.where(grow, growth_returns[rng.integers(0, growth_returns.size, paths)] - GROWTH_TEST_STAKE, 0)
+        if level >= 3:
+            hit = rng.random(paths) < SURPRISE_CHANCE
+            take_coins(wallet, bank, np.where(hit, surprise_costs[rng.integers(0, surprise_costs.size, paths)], 0))
+        to_goal[(to_goal == NOT_REACHED) & (bank[None, :] >= amounts[:, None])] = m
+
+    missions = np.where(to_goal == NOT_REACHED, np.inf, to_goal)
+    low, median, high = np.percentile(missions, [10, 50, 90], axis=1, method="nearest")
+
+    def count(value):
+        return int(value) if np.isfinite(value) else None
+
+    return GoalForecast(
+        key=key,
+        goals=tuple(
+            GoalEstimate(
+                name=name,
+                amount=amount,
+                median=count(median[i]),
+                low=count(low[i]),
+                high=count(high[i]),
+                reached=float((to_goal[i] != NOT_REACHED).mean()),
+            )
+            for i, (name, amount) in enumerate(goals)
+        ),
+        missions_used=used,
+    )
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from mission_engine import GameState
+
+    state = GameState(level=6, allowance=12, active_subscriptions={"Music app (2 coins/mission)"})
+    engine = MissionEngine(state, random.Random(3))
+    for m in range(40):
+        engine.pay_allowance()
+        engine.finish_mission(int(state.wallet) // 2, 2, growth_test=m % 2 == 0)
+    t0 = time.perf_counter()
+    forecast = forecast_goals(state)
+    t1 = time.perf_counter()
+    print(f"bank {state.bank}, {PATHS} futures from {forecast.missions_used} missions in {(t1 - t0) * 1000:.0f} ms")
+    for goal in forecast.goals:
+        print(f"    {goal.name} ({goal.amount}): {goal.describe()}, reached in {goal.reached:.0%} of futures")
@@ -0,0 +1,108 @@
+"""Growth Lab for level 6: what could happen to coins held for 1 to 52 weeks.
+
+Each risk profile (``content.GROWTH_PROFILES``) gives a typical yearly growth
+and yearly swing; a week's change is drawn so that 52 of them add up to those
+(log-normal, the usual model for savings and shares). A profile is simulated
+once, for ``PATHS`` paths of ``MAX_WEEKS`` weeks starting from one coin, and
+reduced to per-week percentiles. Growth is multiplicative, so any amount is that table
+scaled, and every ``(amount, weeks, profile)`` fan is memoized on top: moving
+the sliders only ever looks results up.
+"""
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from content import GROWTH_PROFILES
+
+PATHS = 100_000
+MAX_WEEKS = 52
+PERCENTILES = (5, 25, 50, 75, 95)
+_CHUNK = 10_000  # paths simulated at a time, to keep the working set small
+
+
+@dataclass(frozen=True)
+class _ProfileTable:
+    bands: np.ndarray  # (len(PERCENTILES), MAX_WEEKS + 1) value of one coin; week 0 is the start
+    loss: np.ndarray  # (MAX_WEEKS + 1,) share of paths below the start
+
+
+@lru_cache(maxsize=None)
+def _profile_table(profile) -> _ProfileTable:
+    growth, swing = GROWTH_PROFILES[profile]
+    # Weekly log changes: the middle path grows by ``growth`` a year, the spread is ``swing`` a year.
+    drift = np.log1p(growth / 100) / 52
+    spread = swing / 100 / np.sqrt(52)
+    rng = np.random.default_rng(zlib.crc32(profile.encode()))
+    values = np.empty((PATHS, MAX_WEEKS + 1), dtype=np.float32)
+    values[:, 0] = 0.0
+    for lo in range(0, PATHS, _CHUNK):
+        weeks = rng.standard_normal((min(_CHUNK, PATHS - lo), MAX_WEEKS), dtype=np.float32)
+        weeks *= spread
+        weeks += drift
+        np.cumsum(weeks, axis=1, out=values[lo : lo + weeks.shape[0], 1:])
+    # Percentiles of the log value are percentiles of the value (exp is increasing).
+    bands = np.exp(np.percentile(values, PERCENTILES, axis=0))
+    loss = (values < -1e-9).mean(axis=0)
+    bands.setflags(write=False)
+    loss.setflags(write=False)
+    return _ProfileTable(bands=bands, loss=loss)
+
+
+@dataclass(frozen=True, eq=False)
+class GrowthFan:
+    amount: int
+    weeks: int
+    profile: str
+    bands: MappingProxyType  # "week" plus "p5" ... "p95", in coins
+    loss_chance: float  # share of futures that end with fewer coins than they started
+
+    def end(self, percentile):
+        return self.bands[f"p{percentile}"][-1]
+
+
+@lru_cache(maxsize=4096)
+def growth_fan(amount: int, weeks: int, profile: str) -> GrowthFan:
+    weeks = max(1, min(int(weeks), MAX_WEEKS))
+    table = _profile_table(profile)
+    bands = {"week": list(range(weeks + 1))}
+    for p, row in zip(PERCENTILES, table.bands):
+        bands[f"p{p}"] = np.round(row[: weeks + 1] * amount, 1).tolist()
+    return GrowthFan(
+        amount=int(amount),
+        weeks=weeks,
+        profile=profile,
+        bands=MappingProxyType(bands),
+        loss_chance=float(table.loss[weeks]),
+    )
+
+
+def fan_chart_spec() -> dict:
+    """Vega-Lite layers for a fan's bands: 90% and 50% of futures shaded, the middle one as a line."""
+    x = {"field": "week", "type": "quantitative", "title": "weeks"}
+    return {
+        "layer": [
+            {
+                "mark": {"type": "area", "opacity": 0.2},
+                "encoding": {"x": x, "y": {"field": "p5", "type": "quantitative", "title": "coins"}, "y2": {"field": "p95"}},
+            },
+            {"mark": {"type": "area", "opacity": 0.4}, "encoding": {"x": x, "y": {"field": "p25", "type": "quantitative"}, "y2": {"field": "p75"}}},
+            {"mark": {"type": "line"}, "encoding": {"x": x, "y": {"field": "p50", "type": "quantitative"}}},
+        ]
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    for profile in GROWTH_PROFILES:
+        t0 = time.perf_counter()
+        fan = growth_fan(20, MAX_WEEKS, profile)
+        t1 = time.perf_counter()
+        growth_fan(35, 12, profile)
+        t2 = time.perf_counter()
+        print(f"{profile}: {PATHS:,} paths x {MAX_WEEKS} weeks in {(t1 - t0) * 1000:.0f} ms, new amount/weeks "
+              f"{(t2 - t1) * 1e6:.0f} us; 20 coins -> {fan.end(5)}/{fan.end(50)}/{fan.end(95)} (p5/p50/p95), "
+              f"{fan.loss_chance:.0%} lose")
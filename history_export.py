@@ -0,0 +1,319 @@
+"""Backups of one child: saved settings, rewards and the full mission history.
+
+Two formats carry the same content:
+
+* CSV for people and spreadsheets: ``#`` lines with the format and the saved
+  state as JSON, then one row per history event.
+* A compact binary file for moving profiles: the same state, then each history
+  chunk as zlib-compressed int64 columns.
+
+Both are written from, and read back into, ``(event, columns, positions, data)``
+blocks of at most ``CHUNK_ROWS`` events, so a long history is never held twice.
+``save_hist``, ``spend_hist`` and the running stats are the ``mission_end``
+saved/spent columns and are rebuilt from them on load.
+
+Support can move a child from the command line::
+
+    python history_export.py export money_missions.db household/1 child1.mmh
+    python history_export.py import money_missions.db household/2 child1.mmh
+    python history_export.py check money_missions.db household/1   # both formats read back the same
+"""
+import argparse
+import io
+import json
+import struct
+import zlib
+
+import numpy as np
+
+from history_store import DEFAULT_COLUMNS, EVENT_COLUMNS, ColumnarHistory
+from persistence import dump_state, parse_state
+
+EXPORT_FORMAT = 1
+CHUNK_ROWS = 1 << 16
+CSV_BLOCK_BYTES = 1 << 22  # about CHUNK_ROWS rows of CSV
+BINARY_MAGIC = b"MMH\x00"
+SAVE_MAGIC = b"MMS"  # see save_codes
+CSV_TITLE = f"# money missions backup, format {EXPORT_FORMAT}"
+_EVENT_FIELDS = dict.fromkeys(name for columns in (*EVENT_COLUMNS.values(), DEFAULT_COLUMNS) for name in columns)
+CSV_COLUMNS = ("position", "event", *_EVENT_FIELDS, "day")
+FORMATS = ("binary", "csv")
+
+_U32 = struct.Struct("<I")
+
+
+class BackupError(ValueError):
+    pass
+
+
+def _event_columns(event):
+    return EVENT_COLUMNS.get(event, DEFAULT_COLUMNS) + ("day",)
+
+
+def _slices(blocks):
+    for event, columns, positions, data in blocks:
+        for lo in range(0, positions.size, CHUNK_ROWS):
+            yield event, list(columns), positions[lo : lo + CHUNK_ROWS], data[:, lo : lo + CHUNK_ROWS]
+
+
+# ============================================================
+# CSV
+# ============================================================
+def write_csv(out, state, blocks):
+    """Write to a text stream. Rows are grouped by chunk; ``position`` gives the play order."""
+    out.write(f"{CSV_TITLE}\n# state: {dump_state(state)}\n{','.join(CSV_COLUMNS)}\n")
+    events = 0
+    for event, columns, positions, data in _slices(blocks):
+        src = {name: j for j, name in enumerate(columns)}
+        present = [name for name in CSV_COLUMNS[2:] if name in src]
+        # One format string per chunk, applied to all its rows in a single call;
+        # columns the event does not have stay empty.
+        line = ",".join(["%d", event] + ["%d" if name in src else "" for name in CSV_COLUMNS[2:]]) + "\n"
+        values = np.vstack([positions] + [data[src[name]] for name in present]).T.ravel().tolist()
+        out.write((line * positions.size) % tuple(values))
+        events += positions.size
+    return events
+
+
+def _batch_blocks(batch):
+    # One pass per column: each is turned into int64 values (and a validity mask
+    # when it has empty fields) once, then every event takes its rows from it.
+    names = set(batch.schema.names)
+    missing = [name for name in ("position", "event") if name not in names]
+    if missing:
+        raise BackupError(f"CSV backup is missing column(s) {', '.join(missing)}")
+    if batch.column("position").null_count or batch.column("event").null_count:
+        raise BackupError("CSV backup has rows without a position or event")
+    positions = batch.column("position").to_numpy()
+    encoded = batch.column("event").dictionary_encode()
+    codes = encoded.indices.to_numpy()
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(encoded.dictionary))
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    converted = {}
+
+    def column(name):
+        if name not in converted:
+            values = batch.column(name)
+            valid = values.is_valid().to_numpy(zero_copy_only=False) if values.null_count else None
+            converted[name] = values.fill_null(0).to_numpy(), valid
+        return converted[name]
+
+    for k, event in enumerate(encoded.dictionary.to_pylist()):
+        rows = order[starts[k] : ends[k]]
+        if rows.size and rows[-1] - rows[0] + 1 == rows.size:
+            rows = slice(int(rows[0]), int(rows[-1]) + 1)  # the usual case: one run, no copy
+        columns = [name for name in _event_columns(event) if name in names]
+        data = np.empty((len(columns), positions[rows].size), dtype=np.int64)
+        for j, name in enumerate(columns):
+            values, valid = column(name)
+            if valid is not None and not valid[rows].all():
+                raise BackupError(f"CSV backup has empty {event} fields")
+            data[j] = values[rows]
+        yield event, columns, positions[rows], data
+
+
+def _read_csv_blocks(stream):
+    # pyarrow (installed with streamlit) reads int64 columns with empty fields exactly
+    # and block by block; imported here to keep app start-up lean.
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    types = {name: pa.int64() for name in CSV_COLUMNS}
+    types["event"] = pa.string()
+    try:
+        reader = pa_csv.open_csv(
+            stream,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+            convert_options=pa_csv.ConvertOptions(column_types=types),
+        )
+        for batch in reader:
+            yield from _batch_blocks(batch)
+    except pa.ArrowInvalid as exc:
+        raise BackupError(f"CSV backup cannot be read: {exc}") from None
+
+
+def read_csv(stream):
+    """``(state, blocks)`` from a binary stream written by :func:`write_csv`; blocks are parsed lazily."""
+    if stream.readline().decode("utf-8").rstrip("\r\n") != CSV_TITLE:
+        raise BackupError("not a money missions CSV backup (or a newer format)")
+    line = stream.readline().decode("utf-8")
+    if not line.startswith("# state: "):
+        raise BackupError("CSV backup has no state line")
+    return parse_state(line[len("# state: ") :]), _read_csv_blocks(stream)
+
+
+# ============================================================
+# Binary
+# ============================================================
+def write_binary(out, state, blocks):
+    """Write to a binary stream: magic, format, state JSON, then length-prefixed compressed chunks."""
+    header = dump_state(state).encode("utf-8")
+    out.write(BINARY_MAGIC + _U32.pack(EXPORT_FORMAT) + _U32.pack(len(header)) + header)
+    events = 0
+    for event, columns, positions, data in _slices(blocks):
+        payload = zlib.compress(
+            np.ascontiguousarray(positions, dtype="<i8").tobytes() + np.ascontiguousarray(data, dtype="<i8").tobytes(), 1
+        )
+        meta = json.dumps({"event": event, "columns": columns, "rows": int(positions.size), "bytes": len(payload)})
+        meta = meta.encode("utf-8")
+        out.write(_U32.pack(len(meta)) + meta + payload)
+        events += positions.size
+    out.write(_U32.pack(0))
+    return events
+
+
+def _read_exact(stream, n):
+    data = stream.read(n)
+    if len(data) != n:
+        raise BackupError("backup file is truncated")
+    return data
+
+
+def _read_binary_blocks(stream):
+    while True:
+        (size,) = _U32.unpack(_read_exact(stream, 4))
+        if size == 0:
+            return
+        meta = json.loads(_read_exact(stream, size))
+        rows, ncols = meta["rows"], len(meta["columns"])
+        try:
+            raw = zlib.decompress(_read_exact(stream, meta["bytes"]))
+        except zlib.error as exc:
+            raise BackupError(f"backup chunk for {meta['event']} is damaged: {exc}") from None
+        values = np.frombuffer(raw, dtype="<i8").astype(np.int64, copy=False)
+        if values.size != rows * (ncols + 1):
+            raise BackupError(f"backup chunk for {meta['event']} has the wrong size")
+        yield meta["event"], meta["columns"], values[:rows], values[rows:].reshape(ncols, rows)
+
+
+def read_binary(stream):
+    if _read_exact(stream, 4) != BINARY_MAGIC:
+        raise BackupError("not a money missions backup file")
+    (fmt,) = _U32.unpack(_read_exact(stream, 4))
+    if fmt != EXPORT_FORMAT:
+        raise BackupError(f"backup format {fmt} is not supported (expected {EXPORT_FORMAT})")
+    (size,) = _U32.unpack(_read_exact(stream, 4))
+    return parse_state(_read_exact(stream, size).decode("utf-8")), _read_binary_blocks(stream)
+
+
+# ============================================================
+# Profiles
+# ============================================================
+def read_backup(stream):
+    """``(state, blocks)`` from a seekable binary stream holding either format, or a save code file."""
+    head = stream.read(len(BINARY_MAGIC))
+    stream.seek(-len(head), io.SEEK_CUR)
+    if head == BINARY_MAGIC:
+        return read_binary(stream)
+    if head.startswith(SAVE_MAGIC):
+        # save_codes builds on this module, so it is imported only when needed.
+        from save_codes import decode_save
+
+        return decode_save(stream.read())
+    return read_csv(stream)
+
+
+def export_profile(store, profile, fmt="binary"):
+    """The saved state and full history of ``profile`` as a file-like object."""
+    store.flush()
+    state = store.load_state(profile) or {}
+    out = io.BytesIO()
+    if fmt == "csv":
+        text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+        write_csv(text, state, store.iter_chunks(profile))
+        text.flush()
+        text.detach()
+    else:
+        write_binary(out, state, store.iter_chunks(profile))
+    out.seek(0)
+    return out
+
+
+def _checked(blocks):
+    for event, columns, positions, data in blocks:
+        if data.shape != (len(columns), positions.size):
+            raise BackupError(f"backup chunk for {event} has mismatched columns")
+        yield event, columns, positions, data
+
+
+def import_profile(store, profile, stream):
+    """Replace ``profile`` with a backup and wait until it is written; returns the number of events.
+
+    Chunks go from the parser straight into the database as they are read, so
+    ``stream`` must stay open until this returns.
+    """
+    state, blocks = read_backup(stream)
+    store.flush()
+    return store.queue_replace(profile, state, _checked(blocks)).result()
+
+
+def _by_event(blocks):
+    # {event: {column: values}} in play order, whatever the chunking.
+    history = ColumnarHistory.from_blocks(blocks)
+    return {event: t.as_dict() for event, t in history.tables.items()}
+
+
+def _first_difference(state, history, got_state, got):
+    # The seeds first: one rounded on the way (e.g. through a float) replays a different game.
+    seeds = history.get("rng_seed", {}).get("seed", np.zeros(0, np.int64))
+    got_seeds = got.get("rng_seed", {}).get("seed", np.zeros(0, np.int64))
+    if got_state.get("rng_seed") != state.get("rng_seed") or not np.array_equal(seeds, got_seeds):
+        return f"seed {state.get('rng_seed')} {seeds.tolist()} came back as {got_state.get('rng_seed')} {got_seeds.tolist()}"
+    for key in state.keys() | got_state.keys():
+        if state.get(key) != got_state.get(key):
+            return f"{key} {state.get(key)!r} came back as {got_state.get(key)!r}"
+    for event in history.keys() | got.keys():
+        want_rows, got_rows = history.get(event, {}), got.get(event, {})
+        if want_rows.keys() != got_rows.keys() or any(not np.array_equal(v, got_rows[k]) for k, v in want_rows.items()):
+            return f"{event} rows differ"
+    return None
+
+
+def check_round_trip(store, profile):
+    """Export ``profile`` in every format and read it back; returns ``{format: first difference or None}``."""
+    store.flush()
+    state = parse_state(dump_state(store.load_state(profile) or {}))
+    history = _by_event(store.iter_chunks(profile))
+    result = {}
+    for fmt in FORMATS:
+        got_state, blocks = read_backup(export_profile(store, profile, fmt))
+        result[fmt] = _first_difference(state, history, got_state, _by_event(blocks))
+    return result
+
+
+def main(argv=None):
+    from persistence import GameStore
+
+    parser = argparse.ArgumentParser(description="Export or import one child's saved game.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for command in ("export", "import", "check"):
+        p = sub.add_parser(command)
+        p.add_argument("db", help="SQLite file")
+        p.add_argument("profile", help="household/child, e.g. default/1")
+        if command != "check":
+            p.add_argument("path")
+        if command == "export":
+            p.add_argument("--format", choices=FORMATS, default=None, help="default: csv for *.csv, else binary")
+    args = parser.parse_args(argv)
+
+    store = GameStore(args.db)
+    if args.command == "export":
+        fmt = args.format or ("csv" if args.path.endswith(".csv") else "binary")
+        with open(args.path, "wb") as f:
+            f.write(export_profile(store, args.profile, fmt).getbuffer())
+        print(f"wrote {args.path}")
+    elif args.command == "check":
+        result = check_round_trip(store, args.profile)
+        for fmt, problem in result.items():
+            print(f"{fmt}: {problem or 'round trip matches'}")
+        return 1 if any(result.values()) else 0
+    else:
+        with open(args.path, "rb") as f:
+            events = import_profile(store, args.profile, f)
+        print(f"imported {events} events into {args.profile}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,443 @@
+"""Append-only columnar mission history backed by growable NumPy arrays.
+
+Each event type ("mission_end", "allowance_paid", ...) gets its own table, so the
+rows of one type are contiguous and every column read is a zero-copy view.
+Detail is kept for the most recent missions only; older (already saved) events
+are rolled into per-day, per-week and per-level aggregates, so memory stays
+flat however long a child plays.
+"""
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+EVENT_COLUMNS = {
+    "mission_end": (
+        "mission",
+        "saved",
+        "spent",
+        "bank",
+        "wallet",
+        "stars",
+        "streak",
+        "level",
+        "allowance",
+        "growth_test",
+        "draws",  # random draws made before the mission settled (see session_rng)
+    ),
+    "allowance_paid": ("mission", "amount"),
+    "allowance_adjust": ("mission", "amount"),
+    "allowance_accrued": ("mission", "amount", "periods", "since", "through"),
+    "subscription_charge": ("mission", "amount"),
+    "surprise": ("mission", "amount"),
+    "rng_seed": ("mission", "seed"),
+    "settings": ("mission", "grade", "level", "allowance", "goal", "goal_amount", "subscriptions", "schedule"),
+    "stars": ("mission", "amount"),
+    "goal_bought": ("mission", "amount", "draws"),
+    "coins": ("mission", "entry", "account", "delta", "reason"),  # see coin_ledger
+    "coin_snapshot": ("mission", "entry", "wallet", "bank"),
+}
+DEFAULT_COLUMNS = ("mission", "amount")
+INITIAL_CAPACITY = 64
+
+# Missions kept in full detail, and how far past that before compacting again.
+RETAIN_MISSIONS = 90
+COMPACT_SLACK = 30
+# Days kept in the per-day rollup; older days are only in the weekly one.
+RETAIN_DAYS = 180
+
+ROLLUP_COLUMNS = (
+    "missions",
+    "goal_met",
+    "saved",
+    "spent",
+    "allowance",
+    "repeat_costs",
+    "surprise_costs",
+    "min_bank",
+    "max_bank",
+    "best_streak",
+    "first_mission",
+    "last_mission",
+)
+_ROLLUP_SUM = ("missions", "goal_met", "saved", "spent", "allowance", "repeat_costs", "surprise_costs")
+_ROLLUP_MIN = ("min_bank", "first_mission")
+_ROLLUP_MAX = ("max_bank", "best_streak", "last_mission")
+_ROLLUP_INDEX = {name: i for i, name in enumerate(ROLLUP_COLUMNS)}
+
+
+_today = [0, 0.0]  # today's ordinal and the timestamp it ends at
+
+
+def today():
+    """``date.today().toordinal()``, recomputed only once the local day is over."""
+    if time.time() >= _today[1]:
+        day = date.today()
+        _today[:] = day.toordinal(), datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+    return _today[0]
+
+
+def week_start(day):
+    """Ordinal of the Monday starting the week of ``day`` (ordinal 1 is a Monday)."""
+    return day - (day - 1) % 7
+
+
+class EventTable:
+    def __init__(self, event, columns, kind=0):
+        self.event = event
+        self.kind = kind
+        self.columns = tuple(columns) + ("day",)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._data = np.zeros((len(self.columns), INITIAL_CAPACITY), dtype=np.int64)
+        self.size = 0
+
+    def _grow(self, needed):
+        capacity = self._data.shape[1]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        data = np.zeros((len(self.columns), capacity), dtype=np.int64)
+        data[:, : self.size] = self._data[:, : self.size]
+        self._data = data
+
+    def append(self, row):
+        self._grow(self.size + 1)
+        self._data[:, self.size] = [int(row.get(name) or 0) for name in self.columns]
+        self.size += 1
+        return self.size - 1
+
+    def append_values(self, values):
+        # One row already in column order (``day`` last), without building a dict.
+        if self.size == self._data.shape[1]:
+            self._grow(self.size + 1)
+        self._data[:, self.size] = values
+        self.size += 1
+        return self.size - 1
+
+    def load(self, columns, data):
+        # Bulk-append a (len(columns), n) block; unknown columns are dropped, missing ones stay 0.
+        n = data.shape[1]
+        self._grow(self.size + n)
+        for j, name in enumerate(columns):
+            if name in self._index:
+                self._data[self._index[name], self.size : self.size + n] = data[j]
+        self.size += n
+
+    def column(self, name):
+        return self._data[self._index[name], : self.size]
+
+    def __getitem__(self, name):
+        return self.column(name)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return self.size
+
+    def row(self, i):
+        return {name: int(self._data[j, i]) for j, name in enumerate(self.columns)}
+
+    def drop_front(self, n):
+        self._data[:, : self.size - n] = self._data[:, n : self.size]
+        self.size -= n
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    def as_dict(self):
+        return {name: self.column(name) for name in self.columns}
+
+
+class RollupTable:
+    """Aggregates (see ``ROLLUP_COLUMNS``) per key, e.g. per week or per level."""
+
+    def __init__(self, key):
+        self.key = key
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.data = np.zeros((len(ROLLUP_COLUMNS), 0), dtype=np.int64)
+
+    @staticmethod
+    def _empty(n):
+        data = np.zeros((len(ROLLUP_COLUMNS), n), dtype=np.int64)
+        for name in _ROLLUP_MIN:
+            data[_ROLLUP_INDEX[name]] = np.iinfo(np.int64).max
+        for name in _ROLLUP_MAX:
+            data[_ROLLUP_INDEX[name]] = np.iinfo(np.int64).min
+        return data
+
+    @staticmethod
+    def _reduce_into(out, idx, data):
+        for name in _ROLLUP_SUM:
+            np.add.at(out[_ROLLUP_INDEX[name]], idx, data[_ROLLUP_INDEX[name]])
+        for name in _ROLLUP_MIN:
+            np.minimum.at(out[_ROLLUP_INDEX[name]], idx, data[_ROLLUP_INDEX[name]])
+        for name in _ROLLUP_MAX:
+            np.maximum.at(out[_ROLLUP_INDEX[name]], idx, data[_ROLLUP_INDEX[name]])
+
+    def add(self, keys, data):
+        """Fold ``data`` (one column per row in ``keys``, any order, repeats allowed) in."""
+        if not len(keys):
+            return
+        merged_keys = np.union1d(self.keys, keys)
+        merged = self._empty(merged_keys.size)
+        self._reduce_into(merged, np.searchsorted(merged_keys, self.keys), self.data)
+        self._reduce_into(merged, np.searchsorted(merged_keys, keys), data)
+        self.keys, self.data = merged_keys, merged
+
+    def keep_last(self, n):
+        if self.keys.size > n:
+            self.keys, self.data = self.keys[-n:].copy(), self.data[:, -n:].copy()
+
+    def merged(self, keys, data):
+        out = RollupTable(self.key)
+        out.keys, out.data = self.keys, self.data
+        out.add(keys, data)
+        return out
+
+    def column(self, name):
+        return self.keys if name == self.key else self.data[_ROLLUP_INDEX[name]]
+
+    def __getitem__(self, name):
+        return self.column(name)
+
+    def __len__(self):
+        return self.keys.size
+
+    def as_dict(self):
+        return {self.key: self.keys, **{name: self.data[i] for i, name in enumerate(ROLLUP_COLUMNS)}}
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.data.nbytes
+
+
+class ColumnarHistory:
+    """List-compatible history: ``append(dict)`` and iteration still work."""
+
+    def __init__(self):
+        self.tables = {}
+        self._order_table = []
+        self._order_row = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self._order_kind = np.zeros(INITIAL_CAPACITY, dtype=np.int16)
+        self._size = 0
+        self._saved = 0
+        self._dropped = 0  # events rolled up and removed from the front
+        self.days = RollupTable("day")
+        self.weeks = RollupTable("week")
+        self.levels = RollupTable("level")
+        self.version = 0
+
+    def table(self, event):
+        t = self.tables.get(event)
+        if t is None:
+            t = EventTable(event, EVENT_COLUMNS.get(event, DEFAULT_COLUMNS), kind=len(self._order_table))
+            self.tables[event] = t
+            self._order_table.append(t)
+        return t
+
+    def events(self, event):
+        # An empty table for unseen event types keeps callers branch-free.
+        t = self.tables.get(event)
+        if t is None:
+            t = EventTable(event, EVENT_COLUMNS.get(event, DEFAULT_COLUMNS))
+        return t
+
+    def _grow_order(self, needed):
+        capacity = self._order_row.size
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._order_row = np.resize(self._order_row, capacity)
+        self._order_kind = np.resize(self._order_kind, capacity)
+
+    def append(self, row):
+        row = dict(row)
+        row.setdefault("day", today())
+        t = self.table(row["event"])
+        self._place(t, t.append(row))
+
+    def append_values(self, event, values):
+        """Append one ``event`` row given as a tuple of its column values in order, ``day`` excluded."""
+        t = self.table(event)
+        self._place(t, t.append_values(values + (today(),)))
+
+    def _place(self, t, i):
+        if self._size == self._order_row.size:
+            self._grow_order(self._size + 1)
+        self._order_row[self._size] = i
+        self._order_kind[self._size] = t.kind
+        self._size += 1
+        self.version += 1
+
+    def _blocks(self, lo, hi):
+        kinds = self._order_kind[lo:hi]
+        rows = self._order_row[lo:hi]
+        positions = np.arange(self._dropped + lo, self._dropped + hi, dtype=np.int64)
+        blocks = []
+        for t in self._order_table:
+            mask = kinds == t.kind
+            if mask.any():
+                blocks.append((t.event, t.columns, positions[mask], t._data[:, rows[mask]]))
+        return blocks
+
+    def take_unsaved(self):
+        """Return ``(event, columns, positions, data)`` blocks appended since the last call."""
+        lo, hi = self._saved, self._size
+        if lo == hi:
+            return []
+        blocks = self._blocks(lo, hi)
+        self._saved = hi
+        return blocks
+
+    def blocks(self):
+        """Every held event as ``take_unsaved``-style blocks, one per event type."""
+        return self._blocks(0, self._size)
+
+    @classmethod
+    def from_blocks(cls, blocks):
+        """Rebuild a history from ``take_unsaved``-style blocks (in any order)."""
+        history = cls()
+        placed = []
+        for event, columns, positions, data in blocks:
+            t = history.table(event)
+            start = t.size
+            t.load(columns, data)
+            placed.append((t.kind, positions, np.arange(start, t.size, dtype=np.int64)))
+        total = sum(p.size for _, p, _ in placed)
+        history._grow_order(total)
+        if placed:
+            order = np.argsort(np.concatenate([p for _, p, _ in placed]), kind="stable")
+            kinds = np.concatenate([np.full(p.size, kind, dtype=np.int16) for kind, p, _ in placed])
+            history._order_kind[:total] = kinds[order]
+            history._order_row[:total] = np.concatenate([rows for _, _, rows in placed])[order]
+        history._size = history._saved = total
+        history.version = total
+        return history
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        for kind, i in zip(self._order_kind[: self._size], self._order_row[: self._size]):
+            t = self._order_table[kind]
+            yield {"event": t.event, **t.row(int(i))}
+
+    def count(self, event):
+        t = self.tables.get(event)
+        return t.size if t is not None else 0
+
+    # --------------------------------------------------------
+    # Rollups
+    # --------------------------------------------------------
+    def _frame(self, counts=None):
+        """Per-mission rollup rows for the first ``counts[event]`` rows of each table (all if None)."""
+        ends = self.events("mission_end")
+        n = ends.size if counts is None else counts.get("mission_end", 0)
+        mission = ends["mission"][:n]
+        data = np.zeros((len(ROLLUP_COLUMNS), n), dtype=np.int64)
+        col = _ROLLUP_INDEX
+        data[col["missions"]] = 1
+        data[col["goal_met"]] = ends["streak"][:n] > 0
+        data[col["saved"]] = ends["saved"][:n]
+        data[col["spent"]] = ends["spent"][:n]
+        data[col["min_bank"]] = data[col["max_bank"]] = ends["bank"][:n]
+        data[col["best_streak"]] = ends["streak"][:n]
+        data[col["first_mission"]] = data[col["last_mission"]] = mission
+        for event, target, sign in (
+            ("allowance_paid", "allowance", 1),
+            ("allowance_adjust", "allowance", 1),
+            ("allowance_accrued", "allowance", 1),
+            ("subscription_charge", "repeat_costs", -1),
+            ("surprise", "surprise_costs", -1),
+        ):
+            t = self.events(event)
+            m = t.size if counts is None else counts.get(event, 0)
+            if m and n:
+                # Join on the mission number; missions still in progress have no mission_end row yet.
+                idx = np.minimum(np.searchsorted(mission, t["mission"][:m]), n - 1)
+                hit = mission[idx] == t["mission"][:m]
+                np.add.at(data[col[target]], idx[hit], sign * t["amount"][:m][hit])
+        return ends["day"][:n], ends["level"][:n], data
+
+    def daily(self):
+        """Per-day aggregates for the last ``RETAIN_DAYS`` days of rollups plus the detail still held."""
+        days, _, data = self._frame()
+        return self.days.merged(days, data)
+
+    def weekly(self):
+        """Per-week aggregates over everything played: the rollups plus the detail still held."""
+        days, _, data = self._frame()
+        return self.weeks.merged(week_start(days), data)
+
+    def by_level(self):
+        _, levels, data = self._frame()
+        return self.levels.merged(levels, data)
+
+    def total(self, name):
+        """All-time total of a summed rollup column (``missions``, ``saved``, ``allowance``, ...)."""
+        return int(self.levels[name].sum() + self._frame()[2][_ROLLUP_INDEX[name]].sum())
+
+    def compact(self, keep_missions=RETAIN_MISSIONS, slack=COMPACT_SLACK):
+        """Roll saved events older than the last ``keep_missions`` missions into the rollups.
+
+        Runs only once the detail exceeds ``keep_missions + slack`` missions, so the
+        cost is amortized. Unsaved events are never dropped. Returns the number of
+        events removed.
+        """
+        ends = self.tables.get("mission_end")
+        if ends is None or ends.size <= keep_missions + slack:
+            return 0
+        cutoff = ends["mission"][ends.size - keep_missions]
+        n = self._saved
+        kinds, rows = self._order_kind[:n], self._order_row[:n]
+        missions = np.empty(n, dtype=np.int64)
+        for t in self._order_table:
+            mask = kinds == t.kind
+            missions[mask] = t["mission"][rows[mask]]
+        newer = np.flatnonzero(missions >= cutoff)
+        k = int(newer[0]) if newer.size else n
+        if k == 0:
+            return 0
+
+        dropped = np.bincount(kinds[:k], minlength=len(self._order_table))
+        counts = {t.event: int(dropped[t.kind]) for t in self._order_table}
+        days, levels, data = self._frame(counts)
+        self.days.add(days, data)
+        self.days.keep_last(RETAIN_DAYS)
+        self.weeks.add(week_start(days), data)
+        self.levels.add(levels, data)
+
+        for t in self._order_table:
+            if dropped[t.kind]:
+                t.drop_front(int(dropped[t.kind]))
+        remaining = self._size - k
+        self._order_kind[:remaining] = self._order_kind[k : self._size]
+        self._order_row[:remaining] = self._order_row[k : self._size] - dropped[self._order_kind[:remaining]]
+        self._size = remaining
+        self._saved -= k
+        self._dropped += k
+        self.version += 1
+        return k
+
+    @property
+    def nbytes(self):
+        """Bytes held in arrays: detail tables, ordering index and rollups."""
+        return (
+            sum(t.nbytes for t in self._order_table)
+            + self._order_row.nbytes
+            + self._order_kind.nbytes
+            + self.days.nbytes
+            + self.weeks.nbytes
+            + self.levels.nbytes
+        )
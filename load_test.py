@@ -0,0 +1,189 @@
+"""Load harness: drive many headless app sessions and measure rerun latency and memory.
+
+Each simulated kid is one ``AppTest`` session with its own household. All N
+sessions stay alive in this process and take turns rerunning, step by step, so
+the numbers describe what one worker process sustains as N grows.
+``AppTest`` swaps process-global runtime objects on every run, so the reruns
+are interleaved rather than run from threads::
+
+    python load_test.py --sessions 1 5 10 20 --missions 3 --out load_results.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "money_missions.py")
+SAVE_SLIDERS = ("save_slider_basic", "save_slider_nv", "jar_save", "save_slider_subs")
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # Peak, not current, RSS; still fine for comparing runs on one machine.
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class Session:
+    """One scripted kid: Kids mode -> Play -> save slider -> finish -> quiz -> shop."""
+
+    def __init__(self, n, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.at.query_params["household"] = f"load-{os.getpid()}-{n}"
+        self.latencies = []
+        self.errors = []
+
+    def _run(self, step, action=None):
+        started = time.perf_counter()
+        (action or self.at).run()
+        self.latencies.append(time.perf_counter() - started)
+        if self.at.exception:
+            self.errors.append(f"{step}: {self.at.exception[0].value}")
+        return step
+
+    def _widget(self, kind, key):
+        try:
+            return getattr(self.at, kind)(key=key)
+        except KeyError:
+            return None
+
+    def _open(self, nav_key, page):
+        yield self._run(nav_key, self.at.button(key=nav_key).click())
+        # The test client does not keep the page a switch_page call moved to.
+        self.at.switch_page(page)
+
+    def mission(self):
+        at = self.at
+        yield from self._open("nav_play", "views/play.py")
+        if at.session_state.play_step != "Mission":
+            yield self._run("play_step_toggle", at.radio(key="play_step_toggle").set_value("Mission"))
+        for key in SAVE_SLIDERS:
+            slider = self._widget("slider", key)
+            if slider is not None:
+                yield self._run("save_slider", slider.set_value(min(slider.max, 4)))
+                break
+        finish = self._widget("button", "finish_mission_btn")
+        if finish is None:
+            self.errors.append(f"finish_mission_btn: not on the page (play_step={at.session_state.play_step!r})")
+            return
+        yield self._run("finish_mission_btn", finish.click())
+        if at.session_state.play_step != "Today’s learning":
+            yield self._run("play_step_toggle", at.radio(key="play_step_toggle").set_value("Today’s learning"))
+        if self._widget("button", "check_quiz_btn") is not None:
+            yield self._run("check_quiz_btn", at.button(key="check_quiz_btn").click())
+
+    def play(self, missions):
+        """Generator: yields after every rerun so sessions can take turns."""
+        yield self._run("first paint")
+        yield self._run("mode_switch_sidebar", self.at.radio(key="mode_switch_sidebar").set_value("Kids"))
+        for _ in range(missions):
+            yield from self.mission()
+        yield from self._open("nav_rewards", "views/rewards.py")
+        if self._widget("button", "buy_Sticker Pack 1") is not None:
+            yield self._run("buy_Sticker Pack 1", self.at.button(key="buy_Sticker Pack 1").click())
+
+
+def run_level(sessions, missions, timeout, offset=0):
+    gc.collect()
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    done = [Session(offset + n, timeout) for n in range(sessions)]
+    active = [s.play(missions) for s in done]
+    while active:
+        # One rerun per live session per round, like kids clicking at the same time.
+        active = [steps for steps in active if next(steps, None) is not None]
+    wall = time.perf_counter() - started
+    gc.collect()
+    # Sessions are still referenced here, so their state counts towards RSS.
+    rss_after = rss_bytes()
+
+    from profiles import memory_bytes
+
+    # RSS deltas are coarse (allocator reuse); the app's own accounting of each
+    # session's state is reported next to them.
+    state_bytes = [memory_bytes(s.at._session_state.filtered_state) for s in done]
+    latencies = np.array([x for s in done for x in s.latencies]) * 1000
+    errors = [e for s in done for e in s.errors]
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies.size else (0.0, 0.0, 0.0)
+    return {
+        "sessions": sessions,
+        "reruns": int(latencies.size),
+        "wall_seconds": round(wall, 3),
+        "reruns_per_second": round(latencies.size / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(float(p50), 2),
+            "p95": round(float(p95), 2),
+            "p99": round(float(p99), 2),
+            "max": round(float(latencies.max()), 2) if latencies.size else 0.0,
+        },
+        "rss_mb": round(rss_after / 2**20, 1),
+        "rss_kb_per_session": round(max(rss_after - rss_before, 0) / 1024 / sessions, 1),
+        "state_kb_per_session": round(sum(state_bytes) / 1024 / sessions, 1),
+        "errors": errors[:20],
+        "error_count": len(errors),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20], help="session counts to try, in order")
+    parser.add_argument("--missions", type=int, default=3, help="missions each session plays")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds allowed per rerun")
+    parser.add_argument("--db", default=None, help="SQLite file for the run (default: a fresh temp file)")
+    parser.add_argument("--out", default="load_results.json")
+    args = parser.parse_args(argv)
+
+    if args.db is None:
+        # Removed at exit, after the store's own atexit flush has run.
+        tmp = tempfile.TemporaryDirectory(prefix="mm-load-")
+        args.db = os.path.join(tmp.name, "load.db")
+    # Must be set before the app (and persistence) is first imported.
+    os.environ["MONEY_MISSIONS_DB"] = args.db
+
+    import streamlit
+
+    results = {
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "missions_per_session": args.missions,
+        "baseline_rss_mb": round(rss_bytes() / 2**20, 1),
+        "levels": [],
+    }
+    offset = 0
+    for n in args.sessions:
+        level = run_level(n, args.missions, args.timeout, offset)
+        offset += n
+        results["levels"].append(level)
+        lat = level["latency_ms"]
+        print(
+            f"{n:>4} sessions: {level['reruns']} reruns, {level['reruns_per_second']:.1f}/s, "
+            f"p50 {lat['p50']:.1f} ms, p95 {lat['p95']:.1f} ms, p99 {lat['p99']:.1f} ms, "
+            f"{level['rss_kb_per_session']:.0f} KB RSS and {level['state_kb_per_session']:.0f} KB state per session, "
+            f"{level['error_count']} errors",
+            flush=True,
+        )
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""Headless mission rules shared by the Streamlit app, batch jobs and simulations."""
+from dataclasses import dataclass, field
+from typing import Optional
+
+from content import GOALS_BY_LEVEL, SUBSCRIPTIONS, SURPRISE_EVENTS
+from history_store import COMPACT_SLACK, RETAIN_MISSIONS, ColumnarHistory, week_start
+from coin_ledger import SNAPSHOT_EVERY, entry_values, snapshot_row, snapshot_values
+from content_packs import content_index
+from running_stats import RunningStats
+from session_rng import SessionRng, new_seed, seed_event
+from star_rules import score_mission, star_award
+
+GROWTH_TEST_STAKE = 5
+GROWTH_TEST_RETURNS = [4, 5, 6, 7]
+SURPRISE_CHANCE = 0.22
+# When the allowance is paid and repeat costs are billed: each mission, or on the calendar.
+ALLOWANCE_SCHEDULES = ("mission", "daily", "weekly")
+ALLOWANCE_UNITS = {"mission": "mission", "daily": "day", "weekly": "week"}  # "10 coins per ..."
+
+
+class MissionError(ValueError):
+    pass
+
+
+# ============================================================
+# State
+# ============================================================
+@dataclass
+class GameState:
+    child_grade: int = 1
+    level: int = 1
+    allowance: int = 10
+    goal_name: str = GOALS_BY_LEVEL[1][0][0]
+    goal_amount: int = GOALS_BY_LEVEL[1][0][1]
+
+    mission: int = 1
+    wallet: int = 0
+    bank: int = 0
+    stars: int = 0
+    streak: int = 0
+
+    mission_paid: bool = False
+    mission_paid_amount: int = 0
+    subscriptions_charged_this_mission: bool = False
+    allowance_schedule: str = "mission"
+    accrued_through: int = 0  # last day (ordinal) a daily/weekly schedule has paid for
+
+    save_hist: list = field(default_factory=list)
+    spend_hist: list = field(default_factory=list)
+    history: ColumnarHistory = field(default_factory=ColumnarHistory)
+    save_stats: RunningStats = field(default_factory=RunningStats)
+    spend_stats: RunningStats = field(default_factory=RunningStats)
+
+    active_subscriptions: set = field(default_factory=set)
+    last_mission_summary: Optional[dict] = None
+
+    # Position in this child's random stream (see session_rng); 0 means "pick a seed".
+    rng_seed: int = 0
+    rng_draws: int = 0
+    ledger_entries: int = 0  # coin movements so far (see coin_ledger)
+
+    def __post_init__(self):
+        if not self.rng_seed:
+            self.rng_seed = new_seed()
+            self.history.append(seed_event(self.rng_seed, self.mission))
+            self.history.append(snapshot_row(self.mission, self.ledger_entries, self.wallet, self.bank))
+
+
+def schedule_periods(schedule, since, today) -> int:
+    """Daily or weekly allowance periods that start after day ``since`` and by ``today``."""
+    if schedule == "daily":
+        return max(0, today - since)
+    if schedule == "weekly":
+        return max(0, (week_start(today) - week_start(since)) // 7)
+    return 0
+
+
+def next_allowance_day(schedule, accrued_through) -> int:
+    """Day (ordinal) the next daily/weekly allowance is paid; 0 on the per-mission schedule."""
+    if schedule == "daily":
+        return accrued_through + 1
+    if schedule == "weekly":
+        return week_start(accrued_through) + 7
+    return 0
+
+
+def subscription_mask(names) -> int:
+    return sum(1 << i for i, name in enumerate(SUBSCRIPTIONS) if name in names)
+
+
+def subscriptions_from_mask(mask: int) -> set:
+    return {name for i, name in enumerate(SUBSCRIPTIONS) if mask >> i & 1}
+
+
+def mission_summary_lines(saved, spent, allowance, lvl):
+    lines = []
+    if saved > 0:
+        lines.append(f"you saved {saved} coins first. that builds a saving habit.")
+    if spent == 0 and saved > 0:
+        lines.append("you skipped buying this time. that protected your goal.")
+    if lvl == 3:
+        lines.append("remember: needs help life run. wants are fun. balance both.")
+    if lvl >= 4:
+        lines.append("a plan helps: set a limit before treats.")
+    if allowance > 0:
+        s_ratio = saved / allowance
+        p_ratio = spent / allowance
+        lines.append(f"your plan today: saved {int(round(s_ratio*100))}% and spent {int(round(p_ratio*100))}%.")
+    return lines
+
+
+# ============================================================
+# Engine
+# ============================================================
+class MissionEngine:
+    """Applies the mission rules to any object with the GameState attributes.
+
+    The app passes ``st.session_state``; batch jobs pass a plain ``GameState``.
+    Random draws come from the child's own seeded stream unless ``rng`` is given.
+    """
+
+    def __init__(self, state, rng=None):
+        self.state = state
+        self.rng = rng if rng is not None else SessionRng(state)
+        self.content = content_index()
+
+    def _move(self, account, delta, reason):
+        # The only place wallet and bank change: every movement is a ledger entry.
+        s = self.state
+        delta = int(delta)
+        if not delta:
+            return
+        setattr(s, account, int(getattr(s, account)) + delta)
+        s.ledger_entries = entry = int(s.ledger_entries) + 1
+        s.history.append_values("coins", entry_values(s.mission, entry, account, delta, reason))
+        if entry % SNAPSHOT_EVERY == 0:
+            s.history.append_values("coin_snapshot", snapshot_values(s.mission, entry, s.wallet, s.bank))
+
+    def _take_coins(self, amount, reason):
+        # Wallet pays first; whatever is left comes out of the piggy bank.
+        s = self.state
+        if int(s.wallet) >= amount:
+            self._move("wallet", -amount, reason)
+        else:
+            remainder = amount - int(s.wallet)
+            self._move("wallet", -int(s.wallet), reason)
+            self._move("bank", -min(remainder, int(s.bank)), reason)
+
+    def subscription_cost(self):
+        s = self.state
+        if int(s.level) < 5:
+            return 0
+        return sum(int(SUBSCRIPTIONS.get(name, 0)) for name in s.active_subscriptions)
+
+    def charge_subscriptions(self):
+        s = self.state
+        if s.allowance_schedule != "mission" or s.subscriptions_charged_this_mission:
+            return
+
+        total = self.subscription_cost()
+        if total > 0:
+            self._take_coins(total, "subscription")
+            s.history.append({"mission": int(s.mission), "event": "subscription_charge", "amount": -total})
+
+        s.subscriptions_charged_this_mission = True
+
+    def allowance_due(self):
+        """Whether pay_allowance would still pay (and bill) the current mission."""
+        s = self.state
+        return s.allowance_schedule == "mission" and not s.mission_paid
+
+    def pay_allowance(self):
+        s = self.state
+        if s.mission_paid:
+            return
+        if s.allowance_schedule != "mission":
+            # Paid and billed by catch_up instead.
+            s.mission_paid = s.subscriptions_charged_this_mission = True
+            s.mission_paid_amount = 0
+            return
+        self._move("wallet", int(s.allowance), "allowance")
+        s.mission_paid = True
+        s.mission_paid_amount = int(s.allowance)
+        s.subscriptions_charged_this_mission = False
+        s.history.append({"mission": int(s.mission), "event": "allowance_paid", "amount": int(s.allowance)})
+        self.charge_subscriptions()
+
+    def sync_allowance_change(self):
+        s = self.state
+        if not s.mission_paid or s.allowance_schedule != "mission":
+            return
+        current_paid = int(s.mission_paid_amount)
+        new_allowance = int(s.allowance)
+        diff = new_allowance - current_paid
+        if diff != 0:
+            self._move("wallet", diff, "allowance_adjust")
+            s.mission_paid_amount = new_allowance
+            s.history.append({"mission": int(s.mission), "event": "allowance_adjust", "amount": diff})
+
+    def catch_up(self, today):
+        """Pay the daily/weekly allowance and bill repeat costs for every period since the last visit.
+
+        Posts one allowance_accrued and one subscription_charge event however long
+        the child was away. Paying every period before billing any ends with the
+        same wallet and bank as alternating them: wallet-then-bank only depends on
+        the total. Returns the number of periods.
+        """
+        s = self.state
+        if s.allowance_schedule == "mission":
+            return 0
+        since = int(s.accrued_through)
+        if not since:  # schedule just started: pay the day or week today is in straight away
+            since = today - 1 if s.allowance_schedule == "daily" else week_start(today) - 1
+        periods = schedule_periods(s.allowance_schedule, since, today)
+        if not periods:
+            return 0
+        s.accrued_through = today
+        credit = periods * int(s.allowance)
+        s.history.append(
+            {
+                "mission": int(s.mission),
+                "event": "allowance_accrued",
+                "amount": credit,
+                "periods": periods,
+                "since": since,
+                "through": today,
+            }
+        )
+        self._move("wallet", credit, "allowance")
+        debit = periods * self.subscription_cost()
+        if debit:
+            self._take_coins(debit, "subscription")
+            s.history.append({"mission": int(s.mission), "event": "subscription_charge", "amount": -debit})
+        return periods
+
+    def record_settings(self):
+        """Note the settings that shape later missions (level, allowance, goal, repeat costs)."""
+        s = self.state
+        goals = [name for name, _ in GOALS_BY_LEVEL.get(int(s.level), GOALS_BY_LEVEL[1])]
+        s.history.append(
+            {
+                "mission": int(s.mission),
+                "event": "settings",
+                "grade": int(s.child_grade),
+                "level": int(s.level),
+                "allowance": int(s.allowance),
+                "goal": goals.index(s.goal_name) if s.goal_name in goals else -1,
+                "goal_amount": int(s.goal_amount),
+                "subscriptions": subscription_mask(s.active_subscriptions),
+                "schedule": ALLOWANCE_SCHEDULES.index(s.allowance_schedule),
+            }
+        )
+
+    def add_stars(self, amount):
+        s = self.state
+        s.stars += int(amount)
+        s.history.append({"mission": int(s.mission), "event": "stars", "amount": int(amount)})
+
+    def buy_goal(self):
+        """Spend the piggy bank on the goal, add the bonus stars and pick the next goal."""
+        s = self.state
+        cost = int(s.goal_amount)
+        if int(s.bank) < cost:
+            raise MissionError("There are not enough coins in the piggy bank for the goal yet.")
+        draws = int(s.rng_draws)
+        self._move("bank", -cost, "goal")
+        s.stars += star_award("goal_bought", self.content)
+        options = GOALS_BY_LEVEL.get(int(s.level), GOALS_BY_LEVEL[1])
+        candidates = [g for g in options if g[0] != s.goal_name]
+        s.goal_name, s.goal_amount = self.rng.choice(candidates) if candidates else options[0]
+        s.history.append({"mission": int(s.mission), "event": "goal_bought", "amount": cost, "draws": draws})
+
+    def finish_mission(self, save, spend, growth_test=False):
+        s = self.state
+        save = int(save)
+        spend = int(spend)
+        lvl = int(s.level)
+        allowance = int(s.allowance)
+
+        if save < 0 or spend < 0:
+            raise MissionError("Coins to save and spend cannot be negative.")
+        if save + spend > int(s.wallet):
+            raise MissionError("You do not have enough coins in your wallet for that choice.")
+
+        draws = int(s.rng_draws)
+        self._move("wallet", -save, "saved")
+        self._move("bank", save, "saved")
+        self._move("wallet", -spend, "spent")
+
+        s.save_hist.append(save)
+        s.spend_hist.append(spend)
+        s.save_stats.push(save)
+        s.spend_stats.push(spend)
+
+        score = score_mission(save, spend, allowance, lvl, self.content)
+
+        growth_result = None
+        growth_skipped = False
+        if lvl >= 6 and growth_test:
+            if int(s.wallet) >= GROWTH_TEST_STAKE:
+                self._move("wallet", -GROWTH_TEST_STAKE, "growth_stake")
+                growth_result = self.rng.choice(GROWTH_TEST_RETURNS)
+                self._move("wallet", growth_result, "growth_return")
+            else:
+                growth_skipped = True
+
+        surprise_text = None
+        if lvl >= 3 and self.rng.random() < SURPRISE_CHANCE:
+            ev_name, ev_delta = self.rng.choice(SURPRISE_EVENTS)
+            self._take_coins(-ev_delta, "surprise")
+            s.history.append({"mission": int(s.mission), "event": "surprise", "amount": int(ev_delta)})
+            surprise_text = f"surprise: {ev_name} ({ev_delta} coins)"
+
+        met_goal = score.goal_met
+        stars_earned = score.stars
+        if met_goal:
+            s.streak += 1
+            goal_text = "Mission goal reached"
+        else:
+            s.streak = 0
+            goal_text = "Mission goal not reached"
+
+        if stars_earned > 0:
+            s.stars += stars_earned
+
+        summary = {
+            "saved": save,
+            "spent": spend,
+            "stars_earned": int(stars_earned),
+            "star_reasons": score.reasons(),
+            "goal_met": met_goal,
+            "goal_text": goal_text,
+            "growth_result": growth_result,
+            "growth_skipped": growth_skipped,
+            "surprise_text": surprise_text,
+            "lines": mission_summary_lines(save, spend, allowance, lvl),
+            "bank": int(s.bank),
+            "wallet": int(s.wallet),
+        }
+        s.last_mission_summary = summary
+
+        s.history.append(
+            {
+                "mission": int(s.mission),
+                "event": "mission_end",
+                "saved": save,
+                "spent": spend,
+                "bank": int(s.bank),
+                "wallet": int(s.wallet),
+                "stars": int(s.stars),
+                "streak": int(s.streak),
+                "level": lvl,
+                "allowance": allowance,
+                "growth_test": int(bool(growth_test)),
+                "draws": draws,
+            }
+        )
+
+        # Older, already saved missions are folded into the history rollups.
+        s.history.compact()
+        if len(s.save_hist) > RETAIN_MISSIONS + COMPACT_SLACK:
+            del s.save_hist[:-RETAIN_MISSIONS]
+            del s.spend_hist[:-RETAIN_MISSIONS]
+
+        s.mission += 1
+        s.mission_paid = False
+        s.mission_paid_amount = 0
+        s.subscriptions_charged_this_mission = False
+        return summary
+
+    def play_mission(self, save, spend, growth_test=False):
+        self.pay_allowance()
+        return self.finish_mission(save, spend, growth_test)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    n = 100_000
+    engine = MissionEngine(GameState(level=6, active_subscriptions={"Music app (2 coins/mission)"}), random.Random(7))
+    t0 = time.perf_counter()
+    for _ in range(n):
+        engine.play_mission(4, 2)
+    elapsed = time.perf_counter() - t0
+    print(f"{n} missions in {elapsed:.3f}s ({elapsed / n * 1e6:.2f} us/mission)")
@@ -0,0 +1,331 @@
+"""Durable SQLite storage for game state with write-behind batching.
+
+The app queues snapshots from the click paths; a background writer drains the
+queue and commits everything that piled up in one WAL transaction, so a click
+never waits on a disk sync.
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+
+import numpy as np
+
+from history_store import RETAIN_MISSIONS, ColumnarHistory
+from profiles import CHILD_KEYS, HOUSEHOLD_KEYS, LIVE_KEYS
+from coin_ledger import snapshot_row
+from running_stats import RunningStats
+from session_rng import new_seed, seed_event
+
+DB_PATH = os.environ.get("MONEY_MISSIONS_DB", "money_missions.db")
+BATCH_WINDOW_SECONDS = 0.25
+MAX_BATCH = 256
+COMPACT_AFTER_CHUNKS = 64
+
+# Per-child game state that survives a browser refresh. UI-only keys (mode,
+# page, parent_verified, coach drafts) are deliberately left out, and the live
+# history objects are stored separately as columnar chunks.
+PERSISTED_KEYS = tuple(k for k in CHILD_KEYS if k not in LIVE_KEYS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    profile TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history_chunks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile TEXT NOT NULL,
+    event TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    positions BLOB NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_chunks_profile ON history_chunks (profile, id);
+"""
+
+
+def _encode(value):
+    if isinstance(value, set):
+        return {"__set__": sorted(value)}
+    raise TypeError(f"cannot persist {type(value).__name__}")
+
+
+def _decode(obj):
+    if "__set__" in obj and len(obj) == 1:
+        return set(obj["__set__"])
+    return obj
+
+
+def dump_state(state, keys=PERSISTED_KEYS) -> str:
+    return json.dumps({k: state[k] for k in keys if k in state}, default=_encode)
+
+
+def parse_state(text):
+    return json.loads(text, object_hook=_decode)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class GameStore:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = _connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="game-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.path)
+        return conn
+
+    # --------------------------------------------------------
+    # Reads
+    # --------------------------------------------------------
+    def load_household(self, household):
+        row = self._reader().execute("SELECT state FROM profiles WHERE profile = ?", (household,)).fetchone()
+        return parse_state(row[0]) if row else None
+
+    def list_children(self, household):
+        rows = self._reader().execute(
+            "SELECT profile FROM profiles WHERE profile > ? AND profile < ?", (household + "/", household + "0")
+        ).fetchall()
+        return [profile.split("/", 1)[1] for (profile,) in rows]
+
+    def profile_versions(self, prefix):
+        """``{profile: updated}`` for every child profile whose key starts with ``prefix``."""
+        rows = self._reader().execute(
+            "SELECT profile, updated FROM profiles WHERE profile >= ? AND profile < ?", (prefix, prefix + "\uffff")
+        )
+        return {profile: updated for profile, updated in rows if "/" in profile}
+
+    def iter_many(self, profiles, batch=500):
+        """Yield ``(profile, state JSON, chunk rows)`` for each of ``profiles``, a batch of profiles per query."""
+        conn = self._reader()
+        for lo in range(0, len(profiles), batch):
+            keys = profiles[lo : lo + batch]
+            marks = ",".join("?" * len(keys))
+            states = dict(conn.execute(f"SELECT profile, state FROM profiles WHERE profile IN ({marks})", keys))
+            chunks = {}
+            for row in conn.execute(
+                f"SELECT profile, event, columns, positions, data FROM history_chunks WHERE profile IN ({marks}) ORDER BY id",
+                keys,
+            ):
+                chunks.setdefault(row[0], []).append(row[1:])
+            for profile in keys:
+                if profile in states:
+                    yield profile, states[profile], chunks.get(profile, [])
+
+    def load_state(self, profile):
+        """The saved state dict without the history, or None for a new profile."""
+        row = self._reader().execute("SELECT state FROM profiles WHERE profile = ?", (profile,)).fetchone()
+        return parse_state(row[0]) if row else None
+
+    def iter_chunks(self, profile):
+        """Yield the saved history as ``(event, columns, positions, data)`` blocks, one chunk at a time."""
+        cursor = self._reader().execute(
+            "SELECT event, columns, positions, data FROM history_chunks WHERE profile = ? ORDER BY id", (profile,)
+        )
+        for event, columns, positions, data in cursor:
+            columns = columns.split(",")
+            yield (
+                event,
+                columns,
+                np.frombuffer(positions, dtype=np.int64),
+                np.frombuffer(data, dtype=np.int64).reshape(len(columns), -1),
+            )
+
+    def load(self, profile):
+        """Return the saved state dict (with a rebuilt history), or None for a new profile."""
+        state = self.load_state(profile)
+        if state is None:
+            return None
+        history = ColumnarHistory.from_blocks(list(self.iter_chunks(profile)))
+        missions = history.events("mission_end")
+        state["save_stats"] = RunningStats.from_values(missions["saved"])
+        state["spend_stats"] = RunningStats.from_values(missions["spent"])
+        # The database keeps every event; the session only holds recent detail.
+        history.compact(RETAIN_MISSIONS, slack=0)
+        missions = history.events("mission_end")
+        if "rng_seed" not in state:  # saved before games were seeded
+            state["rng_seed"], state["rng_draws"] = new_seed(), 0
+            history.append(seed_event(state["rng_seed"], state.get("mission", 1)))
+        if "ledger_entries" not in state:  # saved before the coin ledger: open it at the saved balances
+            state["ledger_entries"] = 0
+            history.append(snapshot_row(state.get("mission", 1), 0, state.get("wallet", 0), state.get("bank", 0)))
+        state["history"] = history
+        state["save_hist"] = missions["saved"].tolist()
+        state["spend_hist"] = missions["spent"].tolist()
+        return state
+
+    # --------------------------------------------------------
+    # Writes (queued)
+    # --------------------------------------------------------
+    def queue_save(self, profile, state):
+        """Snapshot ``state`` now and persist it in the background."""
+        snapshot = dump_state(state)
+        blocks = [
+            (event, ",".join(columns), positions.tobytes(), np.ascontiguousarray(data).tobytes())
+            for event, columns, positions, data in state["history"].take_unsaved()
+        ]
+        self._queue.put(("save", profile, snapshot, blocks))
+
+    def queue_household(self, household, state):
+        snapshot = dump_state(state, HOUSEHOLD_KEYS)
+        self._queue.put(("save", household, snapshot, []))
+
+    def queue_reset(self, profile):
+        self._queue.put(("reset", profile, None, None))
+
+    def queue_replace(self, profile, state, blocks):
+        """Swap a profile's saved state and history for ``state`` and ``(event, columns, positions, data)`` blocks.
+
+        ``blocks`` may be a generator: the writer encodes and inserts one block at a
+        time inside a single transaction, so the history is never held whole. Returns
+        a Future for the number of events written; if ``blocks`` raises, nothing
+        changes and ``result()`` raises the same error.
+        """
+        done = Future()
+        self._queue.put(("replace", profile, dump_state(state), (blocks, done)))
+        return done
+
+    def flush(self):
+        self._queue.join()
+
+    def _run(self):
+        conn = _connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+            while len(batch) < MAX_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(conn, batch)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, conn, batch):
+        # Replacements get a transaction of their own, so a bad backup cannot roll back other saves.
+        run = []
+        for item in batch:
+            if item[0] != "replace":
+                run.append(item)
+                continue
+            if run:
+                self._write(conn, run)
+                run = []
+            self._replace(conn, *item[1:])
+        if run:
+            self._write(conn, run)
+
+    def _replace(self, conn, profile, snapshot, job):
+        blocks, done = job
+        events = 0
+        conn.execute("BEGIN")
+        try:
+            conn.execute("DELETE FROM history_chunks WHERE profile = ?", (profile,))
+            for event, columns, positions, data in blocks:
+                conn.execute(
+                    "INSERT INTO history_chunks (profile, event, columns, positions, data) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        profile,
+                        event,
+                        ",".join(columns),
+                        np.ascontiguousarray(positions, dtype=np.int64).tobytes(),
+                        np.ascontiguousarray(data, dtype=np.int64).tobytes(),
+                    ),
+                )
+                events += positions.size
+            conn.execute(
+                "INSERT INTO profiles (profile, state, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (profile) DO UPDATE SET state = excluded.state, updated = excluded.updated",
+                (profile, snapshot, time.time()),
+            )
+            self._compact(conn, profile)
+            conn.execute("COMMIT")
+        except Exception as exc:
+            conn.execute("ROLLBACK")
+            done.set_exception(exc)
+            return
+        done.set_result(events)
+
+    def _write(self, conn, batch):
+        now = time.time()
+        touched = set()
+        conn.execute("BEGIN")
+        try:
+            for kind, profile, snapshot, blocks in batch:
+                if kind == "reset":
+                    conn.execute("DELETE FROM history_chunks WHERE profile = ?", (profile,))
+                    conn.execute("DELETE FROM profiles WHERE profile = ?", (profile,))
+                    continue
+                conn.executemany(
+                    "INSERT INTO history_chunks (profile, event, columns, positions, data) VALUES (?, ?, ?, ?, ?)",
+                    [(profile, *block) for block in blocks],
+                )
+                conn.execute(
+                    "INSERT INTO profiles (profile, state, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT (profile) DO UPDATE SET state = excluded.state, updated = excluded.updated",
+                    (profile, snapshot, now),
+                )
+                touched.add(profile)
+            for profile in touched:
+                self._compact(conn, profile)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _compact(self, conn, profile):
+        # Merge many small per-click chunks into one chunk per event type.
+        (count,) = conn.execute("SELECT COUNT(*) FROM history_chunks WHERE profile = ?", (profile,)).fetchone()
+        if count <= COMPACT_AFTER_CHUNKS:
+            return
+        rows = conn.execute(
+            "SELECT event, columns, positions, data FROM history_chunks WHERE profile = ? ORDER BY id", (profile,)
+        ).fetchall()
+        merged = {}
+        for event, columns, positions, data in rows:
+            ncols = len(columns.split(","))
+            entry = merged.setdefault((event, columns), ([], []))
+            entry[0].append(np.frombuffer(positions, dtype=np.int64))
+            entry[1].append(np.frombuffer(data, dtype=np.int64).reshape(ncols, -1))
+        conn.execute("DELETE FROM history_chunks WHERE profile = ?", (profile,))
+        conn.executemany(
+            "INSERT INTO history_chunks (profile, event, columns, positions, data) VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    profile,
+                    event,
+                    columns,
+                    np.concatenate(positions).tobytes(),
+                    np.ascontiguousarray(np.concatenate(data, axis=1)).tobytes(),
+                )
+                for (event, columns), (positions, data) in merged.items()
+            ],
+        )
@@ -0,0 +1,162 @@
+"""Opt-in per-section rerun timings kept in a rolling buffer.
+
+Turned on with ``MONEY_MISSIONS_PROFILE=1`` (or from the parent diagnostics
+page); ``MONEY_MISSIONS_PROFILE_LOG=path`` also appends every run to a
+JSON-lines file. When off, ``section()`` hands back one shared no-op context
+manager and ``timed`` wrappers cost a single flag check.
+"""
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+
+import numpy as np
+
+BUFFER_SIZE = 5000
+LOG_PATH = os.environ.get("MONEY_MISSIONS_PROFILE_LOG") or None
+
+_enabled = os.environ.get("MONEY_MISSIONS_PROFILE", "") not in ("", "0") or LOG_PATH is not None
+_records = deque(maxlen=BUFFER_SIZE)  # (wall time, run id, section, ms)
+_runs = itertools.count(1)
+_local = threading.local()
+_log_lock = threading.Lock()
+_log = None
+_OFF = nullcontext()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def clear():
+    _records.clear()
+
+
+class _Section:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+def _record(name, ms):
+    record = (time.time(), getattr(_local, "run", 0), name, ms)
+    _records.append(record)
+    if LOG_PATH is not None:
+        _write_log(record)
+
+
+def _write_log(record):
+    global _log
+    ts, run, name, ms = record
+    line = json.dumps({"ts": round(ts, 3), "run": run, "section": name, "ms": round(ms, 3)}) + "\n"
+    with _log_lock:
+        if _log is None:
+            _log = open(LOG_PATH, "a", encoding="utf-8")
+            atexit.register(flush_log)
+        _log.write(line)
+
+
+def section(name):
+    """``with section("sidebar"): ...`` times the block when profiling is on."""
+    return _Section(name) if _enabled else _OFF
+
+
+def timed(name=None):
+    """Decorator form of :func:`section` for hot helpers."""
+
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(label, (time.perf_counter() - started) * 1000)
+
+        return wrapper
+
+    return decorate
+
+
+def start_run():
+    """Mark the start of a script run; earlier runs' log lines reach the disk here."""
+    flush_log()
+    # Each rerun executes on its own thread, so the run id is thread-local.
+    _local.run = next(_runs) if _enabled else 0
+
+
+def flush_log():
+    with _log_lock:
+        if _log is not None:
+            _log.flush()
+
+
+def records():
+    return list(_records)
+
+
+def summary():
+    """Per-section count, mean, p50, p95 and max (ms) over the buffer, slowest mean first."""
+    by_section = {}
+    for _, _, name, ms in list(_records):
+        by_section.setdefault(name, []).append(ms)
+    rows = []
+    for name, values in by_section.items():
+        values = np.asarray(values)
+        p50, p95 = np.percentile(values, [50, 95])
+        rows.append(
+            {
+                "section": name,
+                "count": int(values.size),
+                "mean_ms": round(float(values.mean()), 3),
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "max_ms": round(float(values.max()), 3),
+            }
+        )
+    rows.sort(key=lambda r: r["mean_ms"], reverse=True)
+    return rows
+
+
+if __name__ == "__main__":
+    n = 1_000_000
+
+    @timed()
+    def helper():
+        return None
+
+    for state in (False, True):
+        enable(state)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            with section("block"):
+                pass
+        t1 = time.perf_counter()
+        for _ in range(n):
+            helper()
+        t2 = time.perf_counter()
+        label = "on " if state else "off"
+        print(f"{label}: section {(t1 - t0) / n * 1e9:.0f} ns, timed helper {(t2 - t1) / n * 1e9:.0f} ns per call")
@@ -0,0 +1,131 @@
+"""Household and child profiles: which state belongs to whom, and how big it is."""
+import sys
+from functools import lru_cache
+from collections import deque
+from collections.abc import Mapping
+
+import numpy as np
+
+import content
+from content_packs import content_index
+from mission_engine import GameState
+
+DEFAULT_CHILD = "1"
+CHILD_AVATARS = ["🦊", "🐼", "🐸", "🐯", "🐙", "🦉", "🐢", "🦁"]
+
+# Per-child keys that are rebuilt from the history on load rather than saved.
+LIVE_KEYS = ("history", "save_hist", "spend_hist", "save_stats", "spend_stats")
+
+# Keys shared by every child of a household.
+HOUSEHOLD_KEYS = ("parent_pin",)
+
+
+def profile_key(household: str, child: str) -> str:
+    return f"{household}/{child}"
+
+
+def child_label(child: str) -> str:
+    # No names (see the Safety box): children are numbered slots with an avatar.
+    try:
+        avatar = CHILD_AVATARS[(int(child) - 1) % len(CHILD_AVATARS)]
+    except ValueError:
+        avatar = "🙂"
+    return f"Child {child} {avatar}"
+
+
+def next_child_id(existing) -> str:
+    numbers = [int(c) for c in existing if str(c).isdigit()]
+    return str(max(numbers, default=0) + 1)
+
+
+def new_child_state() -> dict:
+    state = vars(GameState())
+    state.update(
+        {
+            "last_day": None,
+            "last_level_for_daily": 1,
+            "quiz_done_today": False,
+            "puzzle_done_today": False,
+            "quiz_ref": None,
+            "puzzle_ref": None,
+            "quiz_feedback": None,
+            "puzzle_feedback": None,
+            "quiz_tries": 0,
+            "quiz_star_awarded": False,
+            "puzzle_tries": 0,
+            "puzzle_star_awarded": False,
+            "review_cards": {},
+            "unlocked_rewards": set(),
+            "unlocked_themes": {"Mint"},
+            "theme_name": "Mint",
+            "sidebar_stickers": set(),
+            "has_trophy": False,
+            "parent_reflection_choice": "Doing great (keep going)",
+        }
+    )
+    return state
+
+
+def new_household_state() -> dict:
+    return {"parent_pin": "1234"}
+
+
+CHILD_KEYS = tuple(new_child_state())
+
+
+def stash_child(state) -> dict:
+    return {key: state[key] for key in CHILD_KEYS if key in state}
+
+
+# ============================================================
+# Memory accounting
+# ============================================================
+def _shared_roots(index):
+    return [getattr(content, name) for name in dir(content) if name.isupper()] + [index]
+
+
+def _shared_ids(index):
+    seen = set()
+    _deep_sizeof(_shared_roots(index), seen, frozenset())
+    return frozenset(seen)
+
+
+def _deep_sizeof(obj, seen, shared):
+    oid = id(obj)
+    if oid in seen or oid in shared:
+        return 0
+    seen.add(oid)
+    if isinstance(obj, np.ndarray):
+        # An owning array's getsizeof includes its buffer; a view's buffer is its base's.
+        return sys.getsizeof(obj) + (_deep_sizeof(obj.base, seen, shared) if obj.base is not None else 0)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        size += sum(_deep_sizeof(k, seen, shared) + _deep_sizeof(v, seen, shared) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(_deep_sizeof(v, seen, shared) for v in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += _deep_sizeof(vars(obj), seen, shared)
+    return size
+
+
+_SHARED = (None, frozenset())
+
+
+def memory_bytes(state, keys=None) -> int:
+    """Bytes held by ``state`` itself, not counting the shared static content."""
+    global _SHARED
+    index = content_index()
+    if _SHARED[0] is not index:
+        _SHARED = (index, _shared_ids(index))
+    keys = list(state.keys()) if keys is None else keys
+    seen = set()
+    return sum(_deep_sizeof(state[k], seen, _SHARED[1]) for k in keys if k in state)
+
+
+def shared_content_bytes() -> int:
+    return _shared_content_bytes(content_index())
+
+
+@lru_cache(maxsize=2)
+def _shared_content_bytes(index) -> int:
+    return _deep_sizeof(_shared_roots(index), set(), frozenset())
@@ -0,0 +1,191 @@
+"""Replay a child's saved history through the mission engine and check it matches.
+
+Every random draw comes from the child's seeded stream (see ``session_rng``) and
+every change made outside a mission (settings, stars, goal purchases) is an
+event, so the recorded events are enough to play the game again. The replay
+feeds the recorded choices back in, seeking the stream to the recorded draw
+counter before each mission and goal purchase, and reports the first event
+that comes out differently::
+
+    python replay.py money_missions.db household/      # every child in a household
+    python replay.py money_missions.db household/1
+    python replay.py child1.mmh                        # a backup file
+"""
+import argparse
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from coin_ledger import audit, balances
+from content import GOALS_BY_LEVEL
+from history_store import ColumnarHistory
+from mission_engine import ALLOWANCE_SCHEDULES, GameState, MissionEngine, subscriptions_from_mask
+
+# Fields compared between the recorded and the replayed game. rng_draws is not one:
+# daily content picks move it on after the last recorded event.
+STATE_FIELDS = ("mission", "bank", "wallet", "stars", "streak", "level", "allowance", "goal_amount", "ledger_entries")
+# Events the engine writes itself while replaying the ones that caused them.
+OUTPUT_EVENTS = ("surprise", "coins")
+
+
+@dataclass
+class ReplayResult:
+    state: GameState
+    events: int
+    divergence: Optional[str]  # first difference, None when the replay matches
+
+
+def _apply_settings(state, row):
+    state.child_grade = row["grade"]
+    state.level = row["level"]
+    state.allowance = row["allowance"]
+    goals = GOALS_BY_LEVEL.get(row["level"], GOALS_BY_LEVEL[1])
+    # A parent's own goal is not in the lists; any other name keeps buy_goal's choices the same.
+    state.goal_name = goals[row["goal"]][0] if 0 <= row["goal"] < len(goals) else "custom goal"
+    state.goal_amount = row["goal_amount"]
+    state.active_subscriptions = subscriptions_from_mask(row["subscriptions"])
+    state.allowance_schedule = ALLOWANCE_SCHEDULES[row["schedule"]]
+
+
+def _replay_row(engine, row):
+    state = engine.state
+    event = row["event"]
+    if event == "rng_seed":
+        state.rng_seed, state.rng_draws = row["seed"], 0
+        state.history.append(row)
+    elif event == "settings":
+        _apply_settings(state, row)
+        state.history.append(row)
+    elif event == "allowance_paid":
+        state.allowance = row["amount"]
+        engine.pay_allowance()
+    elif event == "allowance_adjust":
+        state.allowance = int(state.mission_paid_amount) + row["amount"]
+        engine.sync_allowance_change()
+    elif event == "allowance_accrued":
+        state.accrued_through = row["since"]
+        engine.catch_up(row["through"])
+    elif event == "subscription_charge":
+        engine.charge_subscriptions()
+    elif event == "stars":
+        engine.add_stars(row["amount"])
+    elif event == "goal_bought":
+        state.rng_draws = row["draws"]
+        engine.buy_goal()
+    elif event == "coin_snapshot":
+        if row["entry"] == 0:  # the opening balance; later snapshots come out of the engine
+            state.wallet, state.bank, state.ledger_entries = row["wallet"], row["bank"], 0
+            state.history.append(row)
+    elif event == "mission_end":
+        # Level and allowance are on every mission, so replays work before settings were recorded.
+        state.level, state.allowance = row["level"], row["allowance"]
+        state.rng_draws = row["draws"]
+        engine.finish_mission(row["saved"], row["spent"], bool(row["growth_test"]))
+    elif event not in OUTPUT_EVENTS:
+        state.history.append(row)
+
+
+def _produced(history):
+    blocks = history.take_unsaved()
+    if not blocks:
+        return []
+    rows = [
+        (int(p), {"event": event, **dict(zip(columns, (int(v) for v in data[:, j])))})
+        for event, columns, positions, data in blocks
+        for j, p in enumerate(positions)
+    ]
+    return [row for _, row in sorted(rows, key=lambda r: r[0])]
+
+
+def _differs(recorded, replayed):
+    if recorded["event"] != replayed["event"]:
+        return True
+    return any(recorded.get(k, 0) != v for k, v in replayed.items() if k != "day")
+
+
+def replay(blocks, saved_state=None) -> ReplayResult:
+    """Replay history blocks; with ``saved_state`` the final game is compared too."""
+    history = ColumnarHistory.from_blocks(blocks)
+    first = next(iter(history), None)
+    seed = first["seed"] if first is not None and first["event"] == "rng_seed" else 1
+    state = GameState(rng_seed=seed, history=ColumnarHistory())
+    engine = MissionEngine(state)
+    recorded, replayed = [], []
+    try:
+        for row in history:
+            recorded.append(row)
+            _replay_row(engine, row)
+            replayed.extend(_produced(state.history))
+    except Exception as exc:
+        return ReplayResult(state, len(recorded), f"event {len(recorded) - 1} ({recorded[-1]}) failed: {exc}")
+
+    for i, (want, got) in enumerate(zip(recorded, replayed)):
+        if _differs(want, got):
+            return ReplayResult(state, len(recorded), f"event {i}: recorded {want}, replayed {got}")
+    if len(recorded) != len(replayed):
+        return ReplayResult(state, len(recorded), f"{len(recorded)} events recorded, {len(replayed)} replayed")
+    bad = audit(history)
+    if bad:
+        return ReplayResult(state, len(recorded), f"coin snapshot(s) at ledger entries {bad} do not add up")
+    if saved_state:
+        if history.count("coin_snapshot"):
+            wallet, bank = balances(history)
+            if (wallet, bank) != (int(saved_state.get("wallet", 0)), int(saved_state.get("bank", 0))):
+                return ReplayResult(state, len(recorded), f"coin ledger ends at wallet {wallet}, bank {bank}")
+        for name in STATE_FIELDS:
+            if name in saved_state and int(saved_state[name]) != int(getattr(state, name)):
+                return ReplayResult(
+                    state, len(recorded), f"saved {name} is {saved_state[name]}, replay ends at {getattr(state, name)}"
+                )
+    return ReplayResult(state, len(recorded), None)
+
+
+def _store_blocks(chunks):
+    for event, columns, positions, data in chunks:
+        columns = columns.split(",")
+        positions = np.frombuffer(positions, dtype=np.int64)
+        yield event, columns, positions, np.frombuffer(data, dtype=np.int64).reshape(len(columns), -1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay saved games and check they come out the same.")
+    parser.add_argument("source", help="SQLite file or a backup file (.mmh / .csv)")
+    parser.add_argument("profiles", nargs="*", help="household/child profiles or household/ prefixes")
+    args = parser.parse_args(argv)
+
+    if not args.source.endswith(".db") and os.path.isfile(args.source):
+        from history_export import read_backup
+
+        with open(args.source, "rb") as f:
+            state, blocks = read_backup(f)
+            result = replay(list(blocks), state)
+        print(f"{args.source}: {result.events} events, {result.divergence or 'matches'}")
+        return 1 if result.divergence else 0
+
+    from persistence import GameStore, parse_state
+
+    store = GameStore(args.source)
+    profiles = []
+    for name in args.profiles or [""]:
+        if "/" in name and not name.endswith("/"):
+            profiles.append(name)
+        else:
+            profiles.extend(sorted(store.profile_versions(name)))
+    t0 = time.perf_counter()
+    events = failed = 0
+    for profile, state_text, chunks in store.iter_many(profiles):
+        result = replay(list(_store_blocks(chunks)), parse_state(state_text))
+        events += result.events
+        if result.divergence:
+            failed += 1
+            print(f"{profile}: {result.divergence}")
+    elapsed = time.perf_counter() - t0
+    print(f"replayed {len(profiles)} children, {events} events in {elapsed:.2f} s; {failed} differ")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""Parent report figures computed from a child's mission history.
+
+Everything is derived with NumPy from the history's weekly and per-level
+rollups plus the detail window it still holds. A report is tied to the
+history's ``version``, so callers can keep it until the history changes.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
+
+from history_store import ColumnarHistory
+
+# Missions needed before a savings trend is worth showing.
+TREND_MIN_MISSIONS = 5
+
+
+def _rate(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def _with_rates(table):
+    out = table.as_dict()
+    out["save_rate"] = _rate(out["saved"], out["allowance"])
+    out["spend_rate"] = _rate(out["spent"], out["allowance"])
+    out["goal_rate"] = _rate(out["goal_met"], out["missions"])
+    return MappingProxyType(out)
+
+
+def streak_lengths(streak):
+    """Length of every goal streak in a per-mission ``streak`` column (the last one may be ongoing)."""
+    streak = np.asarray(streak)
+    if not streak.size:
+        return streak[:0]
+    ends = (streak > 0) & (np.append(streak[1:], 0) <= streak)
+    return streak[ends]
+
+
+@dataclass(frozen=True, eq=False)
+class HistoryReport:
+    history: ColumnarHistory
+    version: int
+    missions: int
+    saved: int
+    spent: int
+    allowance: int
+    save_rate: float  # saved / allowance paid
+    spend_rate: float
+    goal_rate: float  # share of missions with the level goal reached
+    weekly: MappingProxyType  # "week" (Monday ordinal) -> rollup columns and rates
+    levels: MappingProxyType  # "level" -> rollup columns and rates
+    trend: float  # change in coins saved per mission, per mission played (recent missions)
+    trend_missions: int  # missions the trend was fitted on (0 when too few)
+    streaks: MappingProxyType  # streak length -> how many times (recent missions)
+    repeat_costs: int
+    repeat_share: float  # repeat costs / allowance paid
+    surprise_costs: int
+    surprises: int
+
+
+def build_report(history: ColumnarHistory) -> HistoryReport:
+    weekly = _with_rates(history.weekly())
+    levels = _with_rates(history.by_level())
+    totals = {name: int(levels[name].sum()) for name in ("missions", "goal_met", "saved", "spent", "allowance")}
+
+    ends = history.events("mission_end")
+    trend, trend_missions = 0.0, 0
+    if ends.size >= TREND_MIN_MISSIONS:
+        x = ends["mission"].astype(np.float64)
+        if np.ptp(x) > 0:
+            trend = float(np.polyfit(x, ends["saved"].astype(np.float64), 1)[0])
+            trend_missions = int(ends.size)
+
+    lengths, counts = np.unique(streak_lengths(ends["streak"]), return_counts=True)
+    repeat_costs = int(levels["repeat_costs"].sum())
+    surprise_costs = int(levels["surprise_costs"].sum())
+    return HistoryReport(
+        history=history,
+        version=history.version,
+        missions=totals["missions"],
+        saved=totals["saved"],
+        spent=totals["spent"],
+        allowance=totals["allowance"],
+        save_rate=float(_rate(totals["saved"], totals["allowance"])),
+        spend_rate=float(_rate(totals["spent"], totals["allowance"])),
+        goal_rate=float(_rate(totals["goal_met"], totals["missions"])),
+        weekly=weekly,
+        levels=levels,
+        trend=trend,
+        trend_missions=trend_missions,
+        streaks=MappingProxyType({int(n): int(c) for n, c in zip(lengths, counts)}),
+        repeat_costs=repeat_costs,
+        repeat_share=float(_rate(repeat_costs, totals["allowance"])),
+        surprise_costs=surprise_costs,
+        # Surprises still in the detail window; older ones only survive as costs.
+        surprises=history.count("surprise"),
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    from mission_engine import GameState, MissionEngine
+
+    state = GameState(level=3, allowance=8)
+    engine = MissionEngine(state)
+    for m in range(365):
+        engine.play_mission(4 + m % 3, 2)
+        state.history.take_unsaved()
+    n = 200
+    t0 = time.perf_counter()
+    for _ in range(n):
+        report = build_report(state.history)
+    t1 = time.perf_counter()
+    print(f"{report.missions} missions, save rate {report.save_rate:.0%}, goal rate {report.goal_rate:.0%}, "
+          f"trend {report.trend:+.3f}/mission, streaks {dict(report.streaks)}")
+    print(f"build_report: {(t1 - t0) / n * 1000:.2f} ms")
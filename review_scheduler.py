@@ -0,0 +1,123 @@
+"""Per-child spaced repetition for the daily quiz and puzzle questions.
+
+Each question a child has seen gets a review card ``[due, interval, ease, reps]``
+(days are ``date.toordinal()`` numbers) in a plain dict that is saved with the
+rest of the child's state. Cards are indexed by a min-heap per (level, kind) so
+picking and grading are O(log n) however large the bank is; questions never
+seen yet are walked in a shuffled order without materialising the pool.
+"""
+import heapq
+import math
+import random
+
+from content_packs import content_index
+
+START_EASE = 2.5
+MIN_EASE = 1.3
+
+# Review quality (SM-2 scale) from the daily outcome.
+QUALITY_FIRST_TRY = 5
+QUALITY_SECOND_TRY = 3
+QUALITY_MISSED = 1
+
+
+def quality_from_outcome(tries: int, star_awarded: bool):
+    """Map ``{kind}_tries`` / ``{kind}_star_awarded`` to a review quality (None if unanswered)."""
+    if tries <= 0:
+        return None
+    if star_awarded:
+        return QUALITY_FIRST_TRY if tries == 1 else QUALITY_SECOND_TRY
+    return QUALITY_MISSED
+
+
+def next_card(card, quality, today):
+    due, interval, ease, reps = card if card else (today, 0, START_EASE, 0)
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if quality < 3:
+        reps, interval = 0, 1
+    else:
+        reps += 1
+        interval = 1 if reps == 1 else 6 if reps == 2 else max(interval + 1, round(interval * ease))
+    return [today + interval, interval, round(ease, 3), reps]
+
+
+class _NewItems:
+    # Visits pool[(offset + k * stride) % n] for k = 0..n-1, a full permutation
+    # when gcd(stride, n) == 1, in O(1) memory: ids are read from the pool by index.
+    def __init__(self, pool, rng):
+        self.pool = pool
+        n = len(pool)
+        self.offset = rng.randrange(n)
+        self.stride = 1
+        if n > 2:
+            self.stride = rng.randrange(1, n)
+            while math.gcd(self.stride, n) != 1:
+                self.stride = rng.randrange(1, n)
+        self.k = 0
+
+    def peek(self, seen):
+        # Only questions already graded (in ``seen``) are stepped over, so one that
+        # was shown but never answered comes up again next time.
+        n = len(self.pool)
+        while self.k < n:
+            item_id = self.pool[(self.offset + self.k * self.stride) % n]["id"]
+            if item_id not in seen:
+                return item_id
+            self.k += 1
+        return None
+
+
+class ReviewScheduler:
+    """Wraps a child's ``review_cards`` dict (mutated in place) with per-pool heaps."""
+
+    def __init__(self, cards, index=None, rng=None):
+        self.cards = cards
+        self.index = index if index is not None else content_index()
+        self.rng = rng if rng is not None else random.Random()
+        self._heaps = {}
+        self._new = {}
+        self._live = {}  # item id -> sequence number of its valid heap entry
+        self._seq = 0
+
+    def _push(self, heap, item_id):
+        self._seq += 1
+        self._live[item_id] = self._seq
+        heapq.heappush(heap, (self.cards[item_id][0], self._seq, item_id))
+
+    def _heap(self, level, kind):
+        key = (level, kind)
+        heap = self._heaps.get(key)
+        if heap is None:
+            heap = []
+            for item_id in self.cards:
+                if self.index.item_levels.get(item_id) == key:
+                    self._seq += 1
+                    self._live[item_id] = self._seq
+                    heap.append((self.cards[item_id][0], self._seq, item_id))
+            heapq.heapify(heap)
+            self._heaps[key] = heap
+        # Entries superseded by a later grade are dropped lazily.
+        while heap and self._live.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+        return heap
+
+    def next_item(self, level, kind, today):
+        """Most overdue card, else a question not seen yet, else the card due soonest."""
+        heap = self._heap(level, kind)
+        if heap and heap[0][0] <= today:
+            return heap[0][2]
+        new = self._new.get((level, kind))
+        if new is None:
+            pool = self.index.levels[level][f"{kind}_pool"]
+            new = self._new[(level, kind)] = _NewItems(pool, self.rng)
+        item_id = new.peek(self.cards)
+        if item_id is not None:
+            return item_id
+        return heap[0][2] if heap else new.pool[0]["id"]
+
+    def grade(self, item_id, quality, today):
+        self.cards[item_id] = next_card(self.cards.get(item_id), quality, today)
+        key = self.index.item_levels.get(item_id)
+        if key in self._heaps:
+            self._push(self._heaps[key], item_id)
+        return self.cards[item_id]
@@ -0,0 +1,95 @@
+"""O(1) running aggregates for per-mission numbers (saved, spent, ...)."""
+import math
+from collections import deque
+
+import numpy as np
+
+WINDOWS = (5, 20)
+
+
+class RollingWindow:
+    def __init__(self, size):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.total = 0
+
+    def push(self, x):
+        if len(self.values) == self.size:
+            self.total -= self.values[0]
+        self.values.append(x)
+        self.total += x
+
+    @property
+    def count(self):
+        return len(self.values)
+
+    @property
+    def mean(self):
+        return self.total / len(self.values) if self.values else 0.0
+
+
+class RunningStats:
+    """Count, sum, mean, variance and min/max (Welford), plus fixed recent windows."""
+
+    def __init__(self, windows=WINDOWS):
+        self.count = 0
+        self.total = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.windows = {size: RollingWindow(size) for size in windows}
+
+    def push(self, x):
+        self.count += 1
+        self.total += x
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+        for window in self.windows.values():
+            window.push(x)
+
+    def extend(self, values):
+        for x in values:
+            self.push(x)
+
+    @classmethod
+    def from_values(cls, values, windows=WINDOWS):
+        """Build the aggregates for a whole array at once (used when restoring saved games)."""
+        values = np.asarray(values)
+        stats = cls(windows)
+        if values.size == 0:
+            return stats
+        stats.count = int(values.size)
+        stats.total = int(values.sum())
+        stats._mean = float(values.mean())
+        stats._m2 = float(values.var() * values.size)
+        stats.min = int(values.min())
+        stats.max = int(values.max())
+        for size, window in stats.windows.items():
+            for x in values[-size:].tolist():
+                window.push(x)
+        return stats
+
+    @property
+    def mean(self):
+        return self._mean if self.count else 0.0
+
+    @property
+    def variance(self):
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def recent_mean(self, size):
+        return self.windows[size].mean
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,397 @@
+"""Save codes: a child's whole game in a few kilobytes, to move it between devices.
+
+A save is ``SAVE_MAGIC``, a version byte, then a zlib-compressed body:
+
+* the state, field by field: counters as int64, flags as bits, texts
+  length-prefixed, the sets as bit masks over the names known when the
+  version was made (other names follow as text), review cards as columns and
+  whatever is left as JSON;
+* the history: the event type of each event in play order, then each event
+  table's columns as differences from the row before, each column in the
+  narrowest integer type that holds it.
+
+The field lists and name catalogs are part of a version and never change. A
+new layout gets the next version and its own ``_decode_vN``; the old decoders
+stay, so every save ever handed out still loads. A save is offered as a file
+or as text (URL-safe base64) that a parent can copy and paste::
+
+    python save_codes.py export money_missions.db household/1 child1.mmsave
+    python save_codes.py import money_missions.db household/2 child1.mmsave
+"""
+import argparse
+import base64
+import binascii
+import io
+import struct
+import sys
+import zlib
+
+import numpy as np
+
+from history_export import SAVE_MAGIC, BackupError, import_profile
+from history_store import ColumnarHistory
+from persistence import dump_state, parse_state
+
+SAVE_VERSION = 1
+COMPRESS_LEVEL = 6
+
+# ============================================================
+# Version 1 layout (frozen)
+# ============================================================
+_V1_INTS = (
+    "child_grade",
+    "level",
+    "allowance",
+    "goal_amount",
+    "mission",
+    "wallet",
+    "bank",
+    "stars",
+    "streak",
+    "mission_paid_amount",
+    "accrued_through",
+    "rng_seed",
+    "rng_draws",
+    "ledger_entries",
+    "last_level_for_daily",
+    "quiz_tries",
+    "puzzle_tries",
+)
+_V1_FLAGS = (
+    "mission_paid",
+    "subscriptions_charged_this_mission",
+    "quiz_done_today",
+    "puzzle_done_today",
+    "quiz_star_awarded",
+    "puzzle_star_awarded",
+    "has_trophy",
+)
+_V1_TEXTS = (
+    "goal_name",
+    "allowance_schedule",
+    "theme_name",
+    "parent_reflection_choice",
+    "last_day",
+    "quiz_ref",
+    "puzzle_ref",
+)
+_V1_SETS = {
+    "active_subscriptions": ("Music app (2 coins/mission)", "Game pass (3 coins/mission)", "Video app (2 coins/mission)"),
+    "unlocked_rewards": ("Sticker Pack 1", "Sticker Pack 2", "Theme Badge", "Super Saver Trophy"),
+    "unlocked_themes": ("Mint", "Ocean", "Sunset"),
+    "sidebar_stickers": ("⭐", "🌈", "🍀", "🚀", "🦄", "🍭"),
+}
+_V1_FIELDS = (*_V1_INTS, *_V1_FLAGS, *_V1_TEXTS, *_V1_SETS, "review_cards")
+
+# Column types by code, narrowest first.
+_INT_TYPES = (np.dtype("<i1"), np.dtype("<i2"), np.dtype("<i4"), np.dtype("<i8"))
+_INT_LIMITS = np.array([np.iinfo(t).max for t in _INT_TYPES[:-1]], dtype=np.int64)
+_NONE = 0xFFFF
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+
+class SaveCodeError(BackupError):
+    pass
+
+
+# ============================================================
+# Byte streams
+# ============================================================
+def _lengths(shapes):
+    """Rows of every column of ``(columns, rows)`` shaped arrays, one after another."""
+    return np.repeat(np.array([rows for _, rows in shapes], dtype=np.int64), [ncols for ncols, _ in shapes])
+
+
+class _Writer:
+    def __init__(self):
+        self.parts = []
+
+    def pack(self, fmt, value):
+        self.parts.append(fmt.pack(value))
+
+    def text(self, value):
+        if value is None:
+            self.pack(_U16, _NONE)
+            return
+        raw = str(value).encode("utf-8")
+        if len(raw) >= _NONE:
+            raise SaveCodeError("a text field is too long for a save code")
+        self.parts.append(_U16.pack(len(raw)) + raw)
+
+    def long_text(self, value):
+        raw = value.encode("utf-8")
+        self.parts.append(_U32.pack(len(raw)) + raw)
+
+    def columns(self, arrays, delta=True):
+        """``(columns, rows)`` int64 arrays: a type code per column, then all columns grouped by code.
+
+        The arrays are handled as one flat run of columns, so the cost does not grow with their number.
+        """
+        lengths = _lengths([a.shape for a in arrays])
+        values = np.concatenate([np.zeros(0, dtype=np.int64), *(a.ravel() for a in arrays)])
+        filled = lengths > 0
+        starts = (np.cumsum(lengths) - lengths)[filled]
+        if delta:
+            diffs = values.copy()
+            diffs[1:] -= values[:-1]
+            diffs[starts] = values[starts]  # each column starts from 0
+            values = diffs
+        codes = np.zeros(lengths.size, dtype=np.uint8)
+        if starts.size:
+            span = np.maximum(np.maximum.reduceat(values, starts), -1 - np.minimum.reduceat(values, starts))
+            codes[filled] = np.searchsorted(_INT_LIMITS, span)
+        self.parts.append(codes.tobytes())
+        each = np.repeat(codes, lengths)
+        for code in sorted(set(codes.tolist())):
+            self.parts.append(values[each == code].astype(_INT_TYPES[code]).tobytes())
+
+    def getvalue(self):
+        return b"".join(self.parts)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.at = 0
+
+    def take(self, n):
+        if self.at + n > len(self.data):
+            raise SaveCodeError("save code is truncated")
+        chunk = self.data[self.at : self.at + n]
+        self.at += n
+        return chunk
+
+    def unpack(self, fmt):
+        return fmt.unpack(self.take(fmt.size))[0]
+
+    def text(self):
+        n = self.unpack(_U16)
+        return None if n == _NONE else str(self.take(n), "utf-8")
+
+    def long_text(self):
+        return str(self.take(self.unpack(_U32)), "utf-8")
+
+    def columns(self, shapes, delta=True):
+        """The arrays written by ``_Writer.columns``, given their ``(columns, rows)`` shapes."""
+        lengths = _lengths(shapes)
+        codes = np.frombuffer(self.take(lengths.size), dtype=np.uint8)
+        each = np.repeat(codes, lengths)
+        values = np.empty(each.size, dtype=np.int64)
+        for code in sorted(set(codes.tolist())):
+            if code >= len(_INT_TYPES):
+                raise SaveCodeError("save code has an unknown column type")
+            picked = each == code
+            dtype = _INT_TYPES[code]
+            values[picked] = np.frombuffer(self.take(int(picked.sum()) * dtype.itemsize), dtype=dtype)
+        if delta and values.size:
+            # One running sum over every column, less what the columns before each one added up to.
+            np.cumsum(values, out=values)
+            starts = np.cumsum(lengths) - lengths
+            before = np.where(starts > 0, values[np.maximum(starts - 1, 0)], 0)
+            values -= np.repeat(before, lengths)
+        arrays, at = [], 0
+        for ncols, rows in shapes:
+            arrays.append(values[at : at + ncols * rows].reshape(ncols, rows))
+            at += ncols * rows
+        return arrays
+
+
+# ============================================================
+# Version 1
+# ============================================================
+def _encode_v1(state, history):
+    out = _Writer()
+    present = 0
+    for i, name in enumerate(_V1_FIELDS):
+        if name in state:
+            present |= 1 << i
+    out.pack(_U64, present)
+
+    out.parts.append(np.array([int(state.get(name, 0)) for name in _V1_INTS], dtype="<i8").tobytes())
+    flags = 0
+    for i, name in enumerate(_V1_FLAGS):
+        if state.get(name):
+            flags |= 1 << i
+    out.pack(_U32, flags)
+    for name in _V1_TEXTS:
+        out.text(state.get(name))
+    for name, catalog in _V1_SETS.items():
+        values = state.get(name) or ()
+        out.pack(_U32, sum(1 << i for i, value in enumerate(catalog) if value in values))
+        extra = sorted(value for value in values if value not in catalog)
+        out.pack(_U16, len(extra))
+        for value in extra:
+            out.text(value)
+
+    cards = state.get("review_cards") or {}
+    out.pack(_U32, len(cards))
+    if cards:
+        out.long_text("\n".join(cards))
+        due, interval, ease, reps = zip(*cards.values())
+        ease = [round(float(e) * 1000) for e in ease]
+        out.columns([np.array([due, interval, ease, reps], dtype=np.int64)])
+    rest = [name for name in state if name not in _V1_FIELDS]
+    out.long_text(dump_state(state, rest) if rest else "")
+
+    blocks = history.blocks()
+    total = len(history)
+    kinds = np.zeros((1, total), dtype=np.int64)
+    base = min((int(positions[0]) for _, _, positions, _ in blocks), default=0)
+    out.pack(_U32, total)
+    out.pack(_U16, len(blocks))
+    for k, (event, columns, positions, data) in enumerate(blocks):
+        kinds[0, positions - base] = k
+        out.text(event)
+        out.text(",".join(columns))
+        out.pack(_U32, positions.size)
+    out.columns([kinds], delta=False)
+    out.columns([data for _, _, _, data in blocks])
+    return out.getvalue()
+
+
+def _decode_v1(body):
+    src = _Reader(body)
+    present = src.unpack(_U64)
+    fields = {}
+    ints = np.frombuffer(src.take(8 * len(_V1_INTS)), dtype="<i8").tolist()
+    fields.update(zip(_V1_INTS, ints))
+    flags = src.unpack(_U32)
+    fields.update((name, bool(flags >> i & 1)) for i, name in enumerate(_V1_FLAGS))
+    fields.update((name, src.text()) for name in _V1_TEXTS)
+    for name, catalog in _V1_SETS.items():
+        mask = src.unpack(_U32)
+        values = {value for i, value in enumerate(catalog) if mask >> i & 1}
+        values.update(src.text() for _ in range(src.unpack(_U16)))
+        fields[name] = values
+
+    n = src.unpack(_U32)
+    fields["review_cards"] = {}
+    if n:
+        ids = src.long_text().split("\n")
+        due, interval, ease, reps = src.columns([(4, n)])[0].tolist()
+        fields["review_cards"] = {
+            item_id: [d, i, e / 1000, r] for item_id, d, i, e, r in zip(ids, due, interval, ease, reps)
+        }
+    state = {name: fields[name] for i, name in enumerate(_V1_FIELDS) if present >> i & 1}
+    rest = src.long_text()
+    if rest:
+        state.update(parse_state(rest))
+
+    total = src.unpack(_U32)
+    tables = [(src.text(), src.text().split(","), src.unpack(_U32)) for _ in range(src.unpack(_U16))]
+    (kinds,) = src.columns([(1, total)], delta=False)
+    if np.bincount(kinds[0], minlength=len(tables)).tolist() != [rows for _, _, rows in tables]:
+        raise SaveCodeError("save code event counts do not match its tables")
+    # Positions of each event type, in play order: a stable sort of the types.
+    order = np.argsort(kinds[0], kind="stable")
+    data = src.columns([(len(columns), rows) for _, columns, rows in tables])
+    blocks, at = [], 0
+    for (event, columns, rows), values in zip(tables, data):
+        blocks.append((event, columns, order[at : at + rows], values))
+        at += rows
+    if src.at != len(src.data):
+        raise SaveCodeError("save code has trailing data")
+    return state, blocks
+
+
+_ENCODERS = {1: _encode_v1}
+_DECODERS = {1: _decode_v1}
+
+
+# ============================================================
+# Saves
+# ============================================================
+def encode_save(state, history, version=SAVE_VERSION) -> bytes:
+    """The saved ``state`` dict and a ``ColumnarHistory`` as save bytes."""
+    return SAVE_MAGIC + _U8.pack(version) + zlib.compress(_ENCODERS[version](state, history), COMPRESS_LEVEL)
+
+
+def decode_save(data):
+    """``(state, blocks)`` from save bytes of any version, like ``history_export.read_backup``."""
+    data = bytes(data)
+    if data[: len(SAVE_MAGIC)] != SAVE_MAGIC or len(data) <= len(SAVE_MAGIC):
+        raise SaveCodeError("not a money missions save code")
+    version = data[len(SAVE_MAGIC)]
+    decoder = _DECODERS.get(version)
+    if decoder is None:
+        raise SaveCodeError(f"save version {version} is newer than this app (up to {SAVE_VERSION})")
+    try:
+        body = zlib.decompress(data[len(SAVE_MAGIC) + 1 :])
+    except zlib.error as exc:
+        raise SaveCodeError(f"save code is damaged: {exc}") from None
+    try:
+        return decoder(body)
+    except (UnicodeDecodeError, ValueError, struct.error) as exc:
+        if isinstance(exc, SaveCodeError):
+            raise
+        raise SaveCodeError(f"save code is damaged: {exc}") from None
+
+
+def save_code(data) -> str:
+    """Save bytes as copyable text."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def parse_code(text) -> bytes:
+    """Save bytes from :func:`save_code` text; spaces and line breaks from copying are ignored."""
+    code = "".join(text.split())
+    try:
+        data = base64.urlsafe_b64decode(code + "=" * (-len(code) % 4))
+    except (binascii.Error, ValueError):
+        data = b""
+    if not data.startswith(SAVE_MAGIC):
+        raise SaveCodeError("that is not a save code (check it was copied in full)")
+    return data
+
+
+# ============================================================
+# Profiles
+# ============================================================
+def export_save(store, profile) -> bytes:
+    """The saved state and full history of ``profile`` as save bytes."""
+    store.flush()
+    state = store.load_state(profile) or {}
+    return encode_save(state, ColumnarHistory.from_blocks(store.iter_chunks(profile)))
+
+
+def import_save(store, profile, data) -> int:
+    """Replace ``profile`` with save bytes (a file or a parsed code); returns the number of events."""
+    return import_profile(store, profile, io.BytesIO(bytes(data)))
+
+
+def main(argv=None):
+    from persistence import GameStore
+
+    parser = argparse.ArgumentParser(description="Export or import one child's save code.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for command in ("export", "import"):
+        p = sub.add_parser(command)
+        p.add_argument("db", help="SQLite file")
+        p.add_argument("profile", help="household/child, e.g. default/1")
+        p.add_argument("path", help="save file; '-' for a text code on stdout/stdin")
+    args = parser.parse_args(argv)
+
+    store = GameStore(args.db)
+    if args.command == "export":
+        data = export_save(store, args.profile)
+        if args.path == "-":
+            print(save_code(data))
+        else:
+            with open(args.path, "wb") as f:
+                f.write(data)
+            print(f"wrote {args.path} ({len(data)} bytes)")
+    else:
+        if args.path == "-":
+            data = parse_code(sys.stdin.read())
+        else:
+            with open(args.path, "rb") as f:
+                data = f.read()
+        print(f"imported {import_save(store, args.profile, data)} events into {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Per-child seeded randomness that can be replayed.
+
+Every child's state carries ``rng_seed`` and ``rng_draws``. :class:`SessionRng`
+draws from a NumPy PCG64 generator at that position, one 64-bit step per draw,
+and moves ``rng_draws`` forward, so any point of a child's play can be rebuilt
+with ``PCG64(seed).advance(draws)`` however many draws came before.
+"""
+import secrets
+
+import numpy as np
+
+
+def new_seed() -> int:
+    # 63 bits so the seed fits the history's int64 columns.
+    return secrets.randbits(63)
+
+
+def seed_event(seed, mission) -> dict:
+    return {"mission": int(mission), "event": "rng_seed", "seed": int(seed)}
+
+
+def generator_at(seed, draws):
+    bits = np.random.PCG64(seed)
+    bits.advance(draws)
+    return np.random.Generator(bits)
+
+
+class SessionRng:
+    """``random()``/``choice()``/``randrange()`` over the seed and draw counter kept on ``state``.
+
+    The position is read from the state before each draw, so switching child or
+    seeking (setting ``rng_draws``) needs no extra bookkeeping.
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self._seed = None
+        self._draws = 0
+        self._gen = None
+
+    def random(self) -> float:
+        seed, draws = int(self.state.rng_seed), int(self.state.rng_draws)
+        if seed != self._seed or draws != self._draws:
+            self._gen = generator_at(seed, draws)
+            self._seed = seed
+        value = float(self._gen.random())
+        self._draws = draws + 1
+        self.state.rng_draws = self._draws
+        return value
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def randrange(self, start, stop=None):
+        if stop is None:
+            start, stop = 0, start
+        return start + int(self.random() * (stop - start))
@@ -0,0 +1,201 @@
+"""Vectorized Monte Carlo simulator for the star economy, level unlocks and goals.
+
+Every simulated child is one lane in a set of NumPy arrays; missions advance all
+lanes at once, so a million child-missions take a fraction of a second.
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from content import GOALS_BY_LEVEL, LEVEL_UNLOCK_STARS, SPEND_OPTIONS_BY_LEVEL, SUBSCRIPTIONS, SURPRISE_EVENTS
+from content_packs import levels
+from mission_engine import GROWTH_TEST_RETURNS, GROWTH_TEST_STAKE, SURPRISE_CHANCE
+from star_rules import score_missions, star_award
+
+NOT_REACHED = -1
+
+
+@dataclass(frozen=True)
+class Strategy:
+    # save_rate: chance each wallet coin goes to the piggy bank.
+    # spend_bias: < 0 prefers cheap buys, > 0 prefers pricey ones.
+    save_rate: float
+    spend_bias: float = 0.0
+    quiz_accuracy: float = 0.7
+
+
+STRATEGIES = {
+    "super_saver": Strategy(save_rate=0.7, spend_bias=-4.0, quiz_accuracy=0.85),
+    "balanced": Strategy(save_rate=0.45, spend_bias=0.0, quiz_accuracy=0.7),
+    "spender": Strategy(save_rate=0.2, spend_bias=3.0, quiz_accuracy=0.55),
+}
+
+
+@dataclass
+class SimulationResult:
+    level: int
+    children: int
+    missions: int
+    missions_to_unlock: np.ndarray
+    missions_to_goal: dict
+    final_stars: np.ndarray
+    final_bank: np.ndarray
+    seconds: float
+
+    def summary(self, percentiles=(10, 50, 90)):
+        # Percentiles cover every child: those who never got there count as "after the
+        # last mission", so a percentile that falls among them is None (beyond the horizon).
+        def describe(arr):
+            reached = arr != NOT_REACHED
+            out = {"reached": float(reached.mean()) if arr.size else 0.0}
+            missions = np.where(reached, arr, np.inf)
+            for p in percentiles:
+                value = np.percentile(missions, p, method="nearest") if arr.size else np.inf
+                out[f"p{p}"] = float(value) if np.isfinite(value) else None
+            return out
+
+        return {
+            "level": self.level,
+            "children": self.children,
+            "missions": self.missions,
+            "unlock": describe(self.missions_to_unlock) if self.missions_to_unlock.size else None,
+            "goals": {name: describe(arr) for name, arr in self.missions_to_goal.items()},
+            "mean_final_stars": float(self.final_stars.mean()),
+            "seconds": self.seconds,
+        }
+
+
+def _resolve_strategies(strategies, children, rng):
+    # Accepts a Strategy, a STRATEGIES name, or a {name or Strategy: weight} mix.
+    if isinstance(strategies, (Strategy, str)):
+        strategies = {strategies: 1.0}
+    chosen = [STRATEGIES[s] if isinstance(s, str) else s for s in strategies]
+    weights = np.array([float(w) for w in strategies.values()])
+    weights = weights / weights.sum()
+
+    pick = rng.choice(len(chosen), size=children, p=weights)
+    save_rate = np.array([c.save_rate for c in chosen])[pick]
+    spend_bias = np.array([c.spend_bias for c in chosen])[pick]
+    quiz_accuracy = np.array([c.quiz_accuracy for c in chosen])[pick]
+    return save_rate, spend_bias, quiz_accuracy
+
+
+def take_coins(wallet, bank, amount):
+    # In place over lanes: the wallet pays first, the rest comes out of the piggy bank.
+    from_wallet = np.minimum(wallet, amount)
+    wallet -= from_wallet
+    np.maximum(bank - (amount - from_wallet), 0, out=bank)
+
+
+def simulate_level(
+    level,
+    children=10_000,
+    missions=100,
+    strategies="balanced",
+    allowance=10,
+    start_stars=None,
+    subscriptions=(),
+    growth_test_rate=0.5,
+    learning=True,
+    seed=None,
+):
+    t0 = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    lvl = int(level)
+    n = int(children)
+
+    save_rate, spend_bias, quiz_accuracy = _resolve_strategies(strategies, n, rng)
+
+    prices = np.array(sorted(SPEND_OPTIONS_BY_LEVEL.get(lvl, SPEND_OPTIONS_BY_LEVEL[2]).values()), dtype=np.int64)
+    top = max(int(prices.max()), 1)
+    spend_weights = np.exp(spend_bias[:, None] * (prices[None, :] / top))
+    spend_cdf = np.cumsum(spend_weights, axis=1)
+    spend_cdf /= spend_cdf[:, -1:]
+
+    sub_cost = sum(int(SUBSCRIPTIONS.get(name, 0)) for name in subscriptions) if lvl >= 5 else 0
+    quiz_stars, puzzle_stars = star_award("quiz"), star_award("puzzle")
+    surprise_deltas = np.array([-d for _, d in SURPRISE_EVENTS], dtype=np.int64)
+    growth_returns = np.array(GROWTH_TEST_RETURNS, dtype=np.int64)
+
+    unlock_needed = LEVEL_UNLOCK_STARS.get(lvl + 1)
+    goals = GOALS_BY_LEVEL.get(lvl, GOALS_BY_LEVEL[1])
+    goal_prices = np.array([amt for _, amt in goals], dtype=np.int64)
+
+    wallet = np.zeros(n, dtype=np.int64)
+    bank = np.zeros(n, dtype=np.int64)
+    stars = np.full(n, LEVEL_UNLOCK_STARS.get(lvl, 0) if start_stars is None else int(start_stars), dtype=np.int64)
+    to_unlock = np.full(n, NOT_REACHED, dtype=np.int64)
+    to_goal = np.full((len(goals), n), NOT_REACHED, dtype=np.int64)
+
+    for m in range(1, int(missions) + 1):
+        wallet += allowance
+        if sub_cost:
+            take_coins(wallet, bank, sub_cost)
+
+        saved = rng.binomial(wallet, save_rate)
+        remaining = wallet - saved
+        spent = prices[(rng.random(n)[:, None] > spend_cdf).sum(axis=1)]
+        spent = np.where(spent <= remaining, spent, 0)
+
+        wallet -= saved + spent
+        bank += saved
+        # The pack's star rules (mission goal included) compile to array-safe expressions.
+        earned = score_missions(saved, spent, allowance, lvl)
+
+        if lvl >= 6 and growth_test_rate > 0:
+            grow = (rng.random(n) < growth_test_rate) & (wallet >= GROWTH_TEST_STAKE)
+            wallet += np.where(grow, growth_returns[rng.integers(0, growth_returns.size, n)] - GROWTH_TEST_STAKE, 0)
+
+        if lvl >= 3:
+            hit = rng.random(n) < SURPRISE_CHANCE
+            cost = np.where(hit, surprise_deltas[rng.integers(0, surprise_deltas.size, n)], 0)
+            take_coins(wallet, bank, cost)
+
+        if learning:
+            earned += quiz_stars * (rng.random(n) < quiz_accuracy) + puzzle_stars * (rng.random(n) < quiz_accuracy)
+        stars += earned
+
+        if unlock_needed is not None:
+            to_unlock[(to_unlock == NOT_REACHED) & (stars >= unlock_needed)] = m
+        reached = (to_goal == NOT_REACHED) & (bank[None, :] >= goal_prices[:, None])
+        to_goal[reached] = m
+
+    return SimulationResult(
+        level=lvl,
+        children=n,
+        missions=int(missions),
+        missions_to_unlock=to_unlock if unlock_needed is not None else np.empty(0, dtype=np.int64),
+        missions_to_goal={name: to_goal[i] for i, (name, _) in enumerate(goals)},
+        final_stars=stars,
+        final_bank=bank,
+        seconds=time.perf_counter() - t0,
+    )
+
+
+def simulate_all_levels(children=10_000, missions=100, seed=None, **kwargs):
+    rng = np.random.default_rng(seed)
+    return {
+        lvl: simulate_level(lvl, children=children, missions=missions, seed=rng.integers(2**63), **kwargs)
+        for lvl in levels()
+    }
+
+
+if __name__ == "__main__":
+    results = simulate_all_levels(
+        children=10_000,
+        missions=100,
+        strategies={"super_saver": 1, "balanced": 2, "spender": 1},
+        subscriptions=["Music app (2 coins/mission)"],
+        seed=42,
+    )
+    total = 0.0
+    for lvl, res in results.items():
+        s = res.summary()
+        total += res.seconds
+        unlock = s["unlock"]
+        unlock_text = f"unlock p50={unlock['p50']} reached={unlock['reached']:.0%}" if unlock else "unlock: top level"
+        print(f"level {lvl}: {unlock_text}")
+        for name, g in s["goals"].items():
+            print(f"    {name}: p10={g['p10']} p50={g['p50']} p90={g['p90']} reached={g['reached']:.0%}")
+    print(f"{len(results)} x 1,000,000 child-missions in {total:.2f}s")
@@ -0,0 +1,87 @@
+"""Stars for finished missions, from the content packs' star rule table.
+
+One evaluator serves both uses: :func:`score_mission` scores a single mission
+and says which rules paid out, :func:`score_missions` scores NumPy arrays of
+missions at once for simulations and batch analysis. Rules compile to
+expressions that work on scalars and arrays alike (see ``content_packs``), so
+changing the star economy is a pack edit.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from content_packs import content_index, levels
+
+
+@dataclass(frozen=True)
+class MissionScore:
+    stars: int
+    goal_met: bool
+    awarded: tuple  # StarRule, in table order
+
+    def reasons(self):
+        return [f"+{rule.stars} {rule.why}" for rule in self.awarded]
+
+
+def star_award(name, index=None) -> int:
+    """Stars for an achievement outside missions: ``quiz``, ``puzzle`` or ``goal_bought``."""
+    return int((index or content_index()).star_awards.get(name, 0))
+
+
+def score_mission(saved, spent, allowance, level, index=None) -> MissionScore:
+    """``index`` saves looking up the content again when scoring many missions."""
+    index = index or content_index()
+    goal = bool(index.levels[level]["mission_goal_fn"](saved, spent, allowance))
+    awarded = tuple(rule for rule in index.star_rules if rule.when(saved, spent, allowance, level, goal))
+    return MissionScore(stars=sum(rule.stars for rule in awarded), goal_met=goal, awarded=awarded)
+
+
+def goals_met(saved, spent, allowance, level):
+    """Each mission's own level goal over arrays (``level`` may be one level or an array)."""
+    info = levels()
+    if np.ndim(level) == 0:
+        return np.broadcast_to(info[int(level)]["mission_goal_fn"](saved, spent, allowance), np.broadcast(saved, spent, allowance).shape)
+    saved, spent, allowance, level = np.broadcast_arrays(saved, spent, allowance, level)
+    met = np.zeros(saved.shape, dtype=bool)
+    for lvl in np.unique(level):
+        rows = level == lvl
+        met[rows] = info[int(lvl)]["mission_goal_fn"](saved[rows], spent[rows], allowance[rows])
+    return met
+
+
+def score_missions(saved, spent, allowance, level, by_rule=False):
+    """Stars for arrays of missions; with ``by_rule`` also ``{rule id: bool array}`` of what paid out."""
+    saved, spent, allowance, level = (np.asarray(v, dtype=np.int64) for v in (saved, spent, allowance, level))
+    goal = goals_met(saved, spent, allowance, level)
+    stars = np.zeros(goal.shape, dtype=np.int64)
+    hits = {}
+    for rule in content_index().star_rules:
+        hit = np.broadcast_to(rule.when(saved, spent, allowance, level, goal), goal.shape)
+        stars += rule.stars * hit
+        if by_rule:
+            hits[rule.id] = hit
+    return (stars, hits) if by_rule else stars
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    allowance = rng.integers(1, 21, n)
+    saved = rng.integers(0, allowance + 1)
+    spent = rng.integers(0, allowance - saved + 1)
+    level = rng.integers(1, 7, n)
+
+    t0 = time.perf_counter()
+    stars, hits = score_missions(saved, spent, allowance, level, by_rule=True)
+    t1 = time.perf_counter()
+    sample = 20_000
+    one_by_one = [score_mission(int(a), int(b), int(c), int(d)).stars for a, b, c, d in
+                  zip(saved[:sample], spent[:sample], allowance[:sample], level[:sample])]
+    t2 = time.perf_counter()
+    assert one_by_one == stars[:sample].tolist()
+    print(f"{n:,} missions in {(t1 - t0) * 1000:.0f} ms batched; one by one {(t2 - t1) / sample * 1e6:.1f} us/mission "
+          f"(~{(t2 - t1) / sample * n:.1f} s for all)")
+    for rule_id, hit in hits.items():
+        print(f"    {rule_id}: {hit.mean():.0%} of missions")
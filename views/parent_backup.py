@@ -0,0 +1,74 @@
+"""Parents page: back up, move or restore the current child."""
+import io
+
+import streamlit as st
+
+from app_state import child_id, game_store, household_id, restore_child
+from history_export import BackupError, export_profile
+from profiles import profile_key
+from save_codes import export_save, parse_code, save_code
+
+store = game_store()
+profile = profile_key(household_id(), child_id())
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Backup 💾")
+st.caption("Everything saved for this child: settings, rewards and every mission played.")
+c1, c2 = st.columns(2)
+with c1:
+    # Built only when clicked, from the saved game rather than this session.
+    st.download_button(
+        "download backup file",
+        data=lambda: export_profile(store, profile, "binary"),
+        file_name=f"money-missions-child-{child_id()}.mmh",
+        mime="application/octet-stream",
+        key="backup_binary_btn",
+    )
+with c2:
+    st.download_button(
+        "download as spreadsheet (CSV)",
+        data=lambda: export_profile(store, profile, "csv"),
+        file_name=f"money-missions-child-{child_id()}.csv",
+        mime="text/csv",
+        key="backup_csv_btn",
+    )
+st.markdown("</div>", unsafe_allow_html=True)
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Move to another device 📲")
+st.caption("A save code is the whole game in a few kilobytes: keep the file, or copy the code and paste it below on the other device.")
+c1, c2 = st.columns(2)
+with c1:
+    st.download_button(
+        "download save file",
+        data=lambda: export_save(store, profile),
+        file_name=f"money-missions-child-{child_id()}.mmsave",
+        mime="application/octet-stream",
+        key="save_file_btn",
+    )
+with c2:
+    show_code = st.button("show save code", key="save_code_btn")
+if show_code:
+    st.code(save_code(export_save(store, profile)), language=None, wrap_lines=True)
+st.markdown("</div>", unsafe_allow_html=True)
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Restore")
+st.caption("Replaces this child's progress with the one in the file. This cannot be undone.")
+upload = st.file_uploader("backup or save file", type=["mmh", "csv", "mmsave"], key="backup_upload")
+if upload is not None and st.button("replace this child's progress", key="backup_restore_btn"):
+    try:
+        events = restore_child(upload)
+    except BackupError as exc:
+        st.error(f"could not restore: {exc}")
+    else:
+        st.success(f"restored {events} saved events. stars: {int(st.session_state.stars)} ⭐")
+pasted = st.text_area("or paste a save code", key="save_code_paste", height=80)
+if pasted.strip() and st.button("replace this child's progress with the code", key="save_code_restore_btn"):
+    try:
+        events = restore_child(io.BytesIO(parse_code(pasted)))
+    except BackupError as exc:
+        st.error(f"could not restore: {exc}")
+    else:
+        st.success(f"restored {events} saved events. stars: {int(st.session_state.stars)} ⭐")
+st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,184 @@
+"""Parents page: settings, coach tip and PIN."""
+import streamlit as st
+
+from app_state import (
+    ai_coach_tip,
+    clamp,
+    default_level_for_grade,
+    ensure_daily_rotation,
+    game_engine,
+    level_unlock_rule,
+    persist,
+    persist_household,
+    sync_allowance_change_in_current_mission,
+)
+from content import GOALS_BY_LEVEL, PARENT_REFLECTION
+from mission_engine import ALLOWANCE_SCHEDULES, ALLOWANCE_UNITS
+
+SCHEDULE_LABELS = {"mission": "every mission", "daily": "every day", "weekly": "every week (Mondays)"}
+
+if not st.session_state.coach_draft_loaded:
+    st.session_state.draft_grade = int(st.session_state.child_grade)
+    st.session_state.draft_level = int(st.session_state.level)
+    st.session_state.draft_allowance = int(st.session_state.allowance)
+    st.session_state.draft_schedule = str(st.session_state.allowance_schedule)
+
+    st.session_state.draft_goal_name = str(st.session_state.goal_name)
+    st.session_state.draft_goal_amount = int(st.session_state.goal_amount)
+
+    st.session_state.draft_goal_pick = "Suggested"
+    st.session_state.coach_draft_loaded = True
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Parent Setup ⚙️")
+st.caption("Change settings below, then press save settings")
+
+st.session_state.draft_grade = st.selectbox(
+    "child grade",
+    [1, 2, 3, 4, 5],
+    index=[1, 2, 3, 4, 5].index(int(st.session_state.draft_grade)),
+    key="coach_grade",
+)
+
+recommended = default_level_for_grade(int(st.session_state.draft_grade))
+st.caption(f"Recommended level: level {recommended}")
+
+max_level_by_grade = clamp(recommended + 1, 1, 6)
+selectable = []
+for lv in range(1, max_level_by_grade + 1):
+    if lv <= recommended or level_unlock_rule(lv, int(st.session_state.stars)):
+        selectable.append(lv)
+if not selectable:
+    selectable = [recommended]
+
+if int(st.session_state.draft_level) not in selectable:
+    st.session_state.draft_level = selectable[0]
+
+st.session_state.draft_level = st.selectbox(
+    "choose level",
+    selectable,
+    index=selectable.index(int(st.session_state.draft_level)),
+    key="coach_level",
+)
+
+st.session_state.draft_schedule = st.selectbox(
+    "pay the allowance",
+    ALLOWANCE_SCHEDULES,
+    index=ALLOWANCE_SCHEDULES.index(st.session_state.draft_schedule),
+    format_func=SCHEDULE_LABELS.get,
+    key="coach_schedule",
+)
+if st.session_state.draft_schedule != "mission":
+    st.caption("Repeat costs are billed on the same days, also while your child is away.")
+
+st.session_state.draft_allowance = st.number_input(
+    f"allowance per {ALLOWANCE_UNITS[st.session_state.draft_schedule]} (coins)",
+    min_value=1,
+    max_value=999,
+    value=int(st.session_state.draft_allowance),
+    step=1,
+    key="coach_allowance",
+)
+
+st.subheader("goal setup")
+goal_options = GOALS_BY_LEVEL.get(int(st.session_state.draft_level), GOALS_BY_LEVEL[1])
+goal_names = [g[0] for g in goal_options]
+goal_dict = dict(goal_options)
+
+st.session_state.draft_goal_pick = st.selectbox(
+    "goal type",
+    ["Suggested", "Custom goal..."],
+    index=0 if st.session_state.draft_goal_pick == "Suggested" else 1,
+    key="coach_goal_type",
+)
+
+if st.session_state.draft_goal_pick == "Suggested":
+    default_idx = 0
+    if st.session_state.draft_goal_name in goal_names:
+        default_idx = goal_names.index(st.session_state.draft_goal_name)
+
+    st.session_state.draft_goal_name = st.selectbox(
+        "choose a goal",
+        goal_names,
+        index=default_idx,
+        key="coach_goal_pick",
+    )
+    st.session_state.draft_goal_amount = int(goal_dict[st.session_state.draft_goal_name])
+    st.caption(f"Goal Cost: {int(st.session_state.draft_goal_amount)} coins")
+else:
+    st.session_state.draft_goal_name = st.text_input(
+        "custom goal name",
+        value=st.session_state.draft_goal_name if st.session_state.draft_goal_name else "my goal",
+        key="coach_goal_custom_name",
+    )
+    st.session_state.draft_goal_amount = st.number_input(
+        "custom goal coins",
+        min_value=5,
+        max_value=9999,
+        value=int(st.session_state.draft_goal_amount) if int(st.session_state.draft_goal_amount) >= 5 else 50,
+        step=1,
+        key="coach_goal_custom_amount",
+    )
+
+st.subheader("parent reflection (quick check)")
+st.session_state.parent_reflection_choice = st.selectbox(
+    "what did your child struggle with most recently?",
+    PARENT_REFLECTION,
+    index=PARENT_REFLECTION.index(st.session_state.parent_reflection_choice) if st.session_state.parent_reflection_choice in PARENT_REFLECTION else 0,
+    key="parent_reflection_pick",
+)
+reflection = st.session_state.parent_reflection_choice
+if reflection == "Spending too much":
+    st.info("try: let’s choose a small treat and still save for the goal. what’s a fair limit?")
+elif reflection == "Forgetting the goal":
+    st.info("try: let’s look at the goal bar. how many coins until we reach it?")
+elif reflection == "Mixing up needs and wants":
+    st.info("try: is this a need for today, or a want for fun? can we do the need first?")
+elif reflection == "Not saving first":
+    st.info("try: let’s save first every mission. even 2 coins counts.")
+else:
+    st.info("try: nice work. what was your best choice today and why?")
+
+st.subheader("coach tip")
+st.info(ai_coach_tip(
+    st.session_state.save_stats,
+    st.session_state.spend_stats,
+    int(st.session_state.streak),
+    int(st.session_state.draft_level),
+))
+
+if st.button("save settings", key="save_settings_btn"):
+    st.session_state.child_grade = int(st.session_state.draft_grade)
+    st.session_state.level = int(st.session_state.draft_level)
+
+    st.session_state.allowance = int(st.session_state.draft_allowance)
+    if st.session_state.draft_schedule != st.session_state.allowance_schedule:
+        st.session_state.allowance_schedule = st.session_state.draft_schedule
+        st.session_state.accrued_through = 0  # the current day or week is paid at once
+
+    name = str(st.session_state.draft_goal_name).strip()
+    st.session_state.goal_name = name if name else "goal"
+    st.session_state.goal_amount = int(st.session_state.draft_goal_amount)
+    # Recorded before the allowance top-up so a replay pays the new amount.
+    game_engine().record_settings()
+    sync_allowance_change_in_current_mission()
+
+    ensure_daily_rotation()
+
+    st.success("Settings saved ✅")
+    persist()
+    st.rerun()
+
+st.markdown("</div>", unsafe_allow_html=True)
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Change Parent PIN 🔐")
+new_pin = st.text_input("new pin", type="password", key="new_pin_input")
+if st.button("update pin", key="update_pin_btn"):
+    if new_pin and len(new_pin) >= 4:
+        st.session_state.parent_pin = new_pin
+        persist_household()
+        st.success("PIN updated ✅")
+    else:
+        st.error("Pin must be at least 4 characters")
+st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,38 @@
+"""Parents page (hidden, /diagnostics): per-section rerun timings."""
+import streamlit as st
+
+import profiler
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Diagnostics 🔧")
+st.caption("Where rerun time goes, per section of the app. Timings are shared by every session on this server.")
+
+on = st.toggle("record section timings", value=profiler.enabled(), key="diag_profile_toggle")
+if on != profiler.enabled():
+    profiler.enable(on)
+    st.rerun()
+if profiler.LOG_PATH:
+    st.caption(f"every run is also appended to {profiler.LOG_PATH}")
+if st.button("clear timings", key="diag_clear_btn"):
+    profiler.clear()
+st.markdown("</div>", unsafe_allow_html=True)
+
+rows = profiler.summary()
+if rows:
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader("by section (slowest first)")
+    st.dataframe(rows, hide_index=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader("latest runs")
+    recent = profiler.records()[-40:]
+    st.dataframe(
+        [{"run": run, "section": name, "ms": round(ms, 3)} for _, run, name, ms in reversed(recent)],
+        hide_index=True,
+    )
+    st.markdown("</div>", unsafe_allow_html=True)
+elif profiler.enabled():
+    st.info("no timings yet. use the app for a bit, then come back.")
+else:
+    st.info("timings are off. turn them on above (or start the app with MONEY_MISSIONS_PROFILE=1).")
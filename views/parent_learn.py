@@ -0,0 +1,19 @@
+"""Parents page: the learning path."""
+import streamlit as st
+
+from app_state import level_unlock_rule
+from content_packs import levels
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("What Kids Learn (Grades 1–5) 📘")
+st.write("This is a learning path. each level adds one new money idea.")
+st.write("Kids practice with missions, then learn with a daily quiz and puzzle.")
+st.markdown("</div>", unsafe_allow_html=True)
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Level Path 🧭")
+for lv, info in levels().items():
+    status = "unlocked" if level_unlock_rule(lv, int(st.session_state.stars)) else "locked"
+    st.write(f"level {lv}: {info['name']} (grade {info['grade_band']}) - {status}")
+    st.caption(info["concept"])
+st.markdown("</div>", unsafe_allow_html=True)
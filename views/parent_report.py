@@ -0,0 +1,135 @@
+"""Parents page: report and per-session resource figures."""
+from datetime import date
+
+import streamlit as st
+
+from app_state import STARTUP, history_report
+from mission_engine import ALLOWANCE_UNITS
+from profiler import section
+from profiles import memory_bytes, shared_content_bytes
+from theme_styles import legacy_stylesheet_bytes
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Parent Report 🧾")
+st.write(f"child grade: {int(st.session_state.child_grade)}")
+st.write(f"current level: {int(st.session_state.level)}")
+unit = ALLOWANCE_UNITS[st.session_state.allowance_schedule]
+st.write(f"allowance: {int(st.session_state.allowance)} coins per {unit}")
+st.write(f"goal: {st.session_state.goal_name} ({int(st.session_state.goal_amount)} coins)")
+if int(st.session_state.level) >= 5:
+    if st.session_state.active_subscriptions:
+        st.write("active subscriptions: " + ", ".join(sorted(st.session_state.active_subscriptions)))
+    else:
+        st.write("active subscriptions: none")
+st.markdown("</div>", unsafe_allow_html=True)
+
+save_stats = st.session_state.save_stats
+spend_stats = st.session_state.spend_stats
+if save_stats:
+    report = history_report()
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader("Simple Insights 💡")
+    st.write(f"average saved per mission: {save_stats.mean:.1f} coins")
+    st.write(f"average spent per mission: {spend_stats.mean:.1f} coins")
+    st.write(f"last 5 missions: saved {save_stats.recent_mean(5):.1f}, spent {spend_stats.recent_mean(5):.1f} on average")
+    st.write(f"most saved in one mission: {save_stats.max} coins")
+    st.write(f"missions played: {report.missions}")
+    st.write(f"allowance paid so far: {report.allowance} coins")
+    if report.repeat_costs:
+        st.write(f"repeat costs paid so far: {report.repeat_costs} coins")
+    st.write(f"current streak: {int(st.session_state.streak)} missions")
+    cards = st.session_state.review_cards
+    if cards:
+        missed = sum(1 for card in cards.values() if card[3] == 0)
+        st.write(f"questions practised: {len(cards)} ({missed} missed last time and coming back soon)")
+    st.write(f"Stars: {int(st.session_state.stars)} ⭐")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    with section("report trends"):
+        st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+        st.subheader("Trends 📊")
+        st.write(
+            f"of the allowance paid, {report.save_rate:.0%} was saved and {report.spend_rate:.0%} spent; "
+            f"the mission goal was reached {report.goal_rate:.0%} of the time."
+        )
+        if report.trend_missions:
+            direction = "up" if report.trend > 0.01 else "down" if report.trend < -0.01 else "steady"
+            st.write(
+                f"saving is trending {direction}: {report.trend * 10:+.1f} coins per mission "
+                f"every 10 missions (last {report.trend_missions} missions)."
+            )
+        if report.repeat_costs:
+            st.write(f"repeat costs took {report.repeat_share:.0%} of the allowance ({report.repeat_costs} coins).")
+        if report.surprise_costs:
+            st.write(f"surprises cost {report.surprise_costs} coins so far.")
+        if report.streaks:
+            st.caption("goal streaks (recent missions): how many streaks of each length")
+            st.bar_chart({"length": list(report.streaks), "streaks": list(report.streaks.values())}, x="length", y="streaks")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        weekly = report.weekly
+        if len(weekly["week"]) > 1:
+            st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+            st.subheader("by week")
+            st.dataframe(
+                [
+                    {
+                        "week of": date.fromordinal(max(int(week), 1)),
+                        "missions": int(n),
+                        "save rate": f"{save_rate:.0%}",
+                        "spend rate": f"{spend_rate:.0%}",
+                        "goal reached": f"{goal_rate:.0%}",
+                    }
+                    for week, n, save_rate, spend_rate, goal_rate in zip(
+                        weekly["week"], weekly["missions"], weekly["save_rate"], weekly["spend_rate"], weekly["goal_rate"]
+                    )
+                ][::-1],
+                hide_index=True,
+            )
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        per_level = report.levels
+        if len(per_level["level"]) > 1:
+            st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+            st.subheader("by level")
+            st.dataframe(
+                [
+                    {
+                        "level": int(level),
+                        "missions": int(n),
+                        "save rate": f"{save_rate:.0%}",
+                        "goal reached": f"{goal_rate:.0%}",
+                        "best streak": int(streak),
+                        "top bank": int(bank),
+                    }
+                    for level, n, save_rate, goal_rate, streak, bank in zip(
+                        per_level["level"],
+                        per_level["missions"],
+                        per_level["save_rate"],
+                        per_level["goal_rate"],
+                        per_level["best_streak"],
+                        per_level["max_bank"],
+                    )
+                ],
+                hide_index=True,
+            )
+            st.markdown("</div>", unsafe_allow_html=True)
+else:
+    st.info("no data yet. play at least one mission to generate a report.")
+
+st.caption(
+    f"this session holds {memory_bytes(st.session_state) / 1024:.1f} KB "
+    f"(history {st.session_state.history.nbytes / 1024:.1f} KB: last {st.session_state.history.count('mission_end')} "
+    "missions in detail, older ones as daily, weekly and per-level totals); "
+    f"shared lesson content is {shared_content_bytes() / 1024:.1f} KB once per server. "
+    f"styles sent this rerun: {int(st.session_state.style_bytes_last_run)} bytes "
+    f"(previously {legacy_stylesheet_bytes(st.session_state.theme_name)} bytes every rerun)."
+)
+
+page_times = st.session_state.get("page_ms", {})
+st.caption(
+    f"startup imports took {STARTUP.get('imports', 0.0):.0f} ms on this server. "
+    "last run per page: "
+    + (", ".join(f"{title} {ms:.0f} ms" for title, ms in sorted(page_times.items())) or "none yet")
+    + ". per-section timings: add /diagnostics to the address."
+)
@@ -0,0 +1,369 @@
+"""Kids page: Play (one mission, then today's learning)."""
+from datetime import date
+
+import streamlit as st
+
+from app_state import (
+    apply_allowance_for_mission_if_needed,
+    compute_progress,
+    daily_item,
+    game_engine,
+    goal_forecast,
+    persist,
+    record_review,
+    rerun_panel,
+    spend_label_with_icons,
+)
+from content import SPEND_OPTIONS_BY_LEVEL, SUBSCRIPTIONS
+from content_packs import levels
+from growth_lab import MAX_WEEKS, fan_chart_spec, growth_fan
+from mission_engine import MissionError, next_allowance_day
+from profiler import section
+from star_rules import star_award
+
+# ============================================================
+# Today's learning (fragments: their buttons rerun only the panel)
+# ============================================================
+DAILY_PANELS = {
+    "quiz": {
+        "title": "Quiz (1 question) 📝",
+        "check": "check quiz answer",
+        "right": "correct",
+        "wrong": "not quite",
+        "done": "Quiz is done for today. come back tomorrow for a new one.",
+    },
+    "puzzle": {
+        "title": "Puzzle (1 question) 🧩",
+        "check": "Check puzzle answer",
+        "right": "nice",
+        "wrong": "almost",
+        "done": "Puzzle is done for today. come back tomorrow for a new one.",
+    },
+}
+
+@st.fragment
+def daily_question_panel(kind: str):
+    panel = DAILY_PANELS[kind]
+    st.write(panel["title"])
+    item = daily_item(kind)
+    st.write(item["q"])
+    choice = st.radio("choose one", item["choices"], key=f"{kind}_choice_kids")
+
+    if st.session_state[f"{kind}_done_today"]:
+        st.caption(panel["done"])
+    else:
+        if st.button(panel["check"], key=f"check_{kind}_btn"):
+            st.session_state[f"{kind}_tries"] += 1
+            if choice == item["answer"]:
+                if not st.session_state[f"{kind}_star_awarded"]:
+                    game_engine().add_stars(star_award(kind))
+                    st.session_state[f"{kind}_star_awarded"] = True
+                st.session_state[f"{kind}_feedback"] = {"type": "success", "text": panel["right"], "tip": ""}
+                st.session_state[f"{kind}_done_today"] = True
+            else:
+                st.session_state[f"{kind}_feedback"] = {"type": "warning", "text": panel["wrong"], "tip": item["tip"]}
+                if st.session_state[f"{kind}_tries"] >= 2:
+                    st.session_state[f"{kind}_done_today"] = True
+            if st.session_state[f"{kind}_done_today"]:
+                record_review(kind)
+            persist()
+            rerun_panel()
+
+    fb = st.session_state[f"{kind}_feedback"]
+    if fb:
+        if fb["type"] == "success":
+            st.success(f"{fb['text']} (+2 stars if first correct)")
+            st.caption(f"you have {int(st.session_state.stars)} stars now ⭐")
+        else:
+            st.warning(fb["text"])
+            if fb.get("tip"):
+                st.info(fb["tip"])
+            remaining = max(0, 2 - int(st.session_state[f"{kind}_tries"]))
+            if not st.session_state[f"{kind}_done_today"]:
+                st.caption(f"tries left: {remaining}")
+
+# ============================================================
+# Growth Lab (level 6; a fragment so the sliders rerun only the lab)
+# ============================================================
+LAB_PROFILES = {"safe": "safe (like a savings account)", "medium": "medium (some shares)", "risky": "risky (all shares)"}
+
+@st.fragment
+def growth_lab_panel():
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader("Growth Lab 🧪")
+    st.caption("What could happen to coins you keep growing for a while? The chart sums up 100,000 possible futures.")
+    c1, c2 = st.columns(2)
+    with c1:
+        amount = st.slider("coins", 1, 200, min(max(int(st.session_state.bank), 1), 200), key="lab_amount")
+    with c2:
+        weeks = st.slider("weeks", 1, MAX_WEEKS, 12, key="lab_weeks")
+    profile = st.radio("risk", list(LAB_PROFILES), format_func=LAB_PROFILES.get, horizontal=True, key="lab_profile")
+
+    fan = growth_fan(amount, weeks, profile)
+    st.vega_lite_chart(dict(fan.bands), fan_chart_spec(), width="stretch")
+    st.caption(
+        f"after {weeks} weeks the middle future has {fan.end(50):g} coins. "
+        f"9 in 10 futures end between {fan.end(5):g} and {fan.end(95):g}, "
+        f"and {fan.loss_chance:.0%} end with less than {amount}."
+    )
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# ============================================================
+# Mission
+# ============================================================
+def _day_text(day):
+    today = date.today().toordinal()
+    if day == today:
+        return "today"
+    if day == today + 1:
+        return "tomorrow"
+    return date.fromordinal(day).strftime("on %A %d %b")
+
+
+def allowance_text():
+    schedule = st.session_state.allowance_schedule
+    if schedule == "mission":
+        return f"you got {int(st.session_state.allowance)} coins for this mission."
+    paid = st.session_state.history.events("allowance_accrued")
+    if not len(paid):
+        return None
+    return f"your {schedule} allowance paid {int(paid['amount'][-1])} coins {_day_text(int(paid['through'][-1]))}."
+
+
+def no_coins_text():
+    schedule = st.session_state.allowance_schedule
+    if schedule == "mission":
+        return "no coins in your wallet for this mission. ask a grown-up about your allowance."
+    day = next_allowance_day(schedule, int(st.session_state.accrued_through))
+    return f"no coins yet — your next allowance arrives {_day_text(day)}."
+
+
+lvl = int(st.session_state.level)
+level_info = levels()[lvl]
+
+apply_allowance_for_mission_if_needed()
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader(f"level {lvl}: {level_info['name']}")
+concept = level_info.get("concept","")
+if concept:
+    st.caption(concept)
+st.markdown("</div>", unsafe_allow_html=True)
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader(f"mission {int(st.session_state.mission)}")
+paid_text = allowance_text()
+if paid_text:
+    st.write(paid_text)
+st.markdown(f'<span class="pill">mission goal: {level_info["mission_goal_text"]}</span>', unsafe_allow_html=True)
+
+st.session_state.play_step = st.radio(
+    "mission steps",
+    ["Mission", "Today’s learning"],
+    index=0 if st.session_state.play_step == "Mission" else 1,
+    horizontal=True,
+    key="play_step_toggle",
+)
+st.markdown("</div>", unsafe_allow_html=True)
+
+if st.session_state.play_step == "Mission":
+    if lvl >= 5:
+        st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+        st.subheader("Repeat Costs (Subscriptions) 🔁")
+        st.caption("These cost coins every mission until you turn them off.")
+        current = set(st.session_state.active_subscriptions)
+        for sub_name, sub_cost in SUBSCRIPTIONS.items():
+            on = sub_name in current
+            new_on = st.checkbox(f"{sub_name} ({sub_cost} coins)", value=on, key=f"sub_{sub_name}")
+            if new_on:
+                st.session_state.active_subscriptions.add(sub_name)
+            else:
+                if sub_name in st.session_state.active_subscriptions:
+                    st.session_state.active_subscriptions.remove(sub_name)
+        if st.session_state.active_subscriptions != current:
+            game_engine().record_settings()
+            persist()
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+
+    spend_amt = 0
+    save_amt = 0
+    do_growth_test = False
+
+    spend_options = SPEND_OPTIONS_BY_LEVEL.get(lvl, SPEND_OPTIONS_BY_LEVEL[2])
+
+    st.caption("Tiny plan: try to save first, then choose a buy that fits your wallet.")
+
+    # Sliders cannot run from 0 to 0, and there is nothing to plan without coins.
+    no_coins = int(st.session_state.wallet) <= 0
+    if no_coins:
+        st.info(no_coins_text())
+
+    elif lvl <= 2:
+        st.subheader("Step 1: save first")
+        save_amt = st.slider(
+            "Move coins into your piggy bank",
+            min_value=0,
+            max_value=int(st.session_state.wallet),
+            value=min(4 if lvl == 2 else 2, int(st.session_state.wallet)),
+            key="save_slider_basic",
+        )
+
+        remaining_wallet = int(st.session_state.wallet) - int(save_amt)
+        st.subheader("Step 2: choose a buy (optional)")
+        spend_choice = st.selectbox("Pick one", list(spend_options.keys()), key="spend_choice_basic")
+        spend_amt = int(spend_options[spend_choice])
+
+        if spend_amt > remaining_wallet:
+            st.warning("That buy is too expensive after saving. pick a smaller buy or save less.")
+
+    elif lvl == 3:
+        st.subheader("Step 1: save first")
+        save_amt = st.slider(
+            "Save coins before spending",
+            min_value=0,
+            max_value=int(st.session_state.wallet),
+            value=min(5, int(st.session_state.wallet)),
+            key="save_slider_nv",
+        )
+
+        remaining_wallet = int(st.session_state.wallet) - int(save_amt)
+        st.subheader("Step 2: need or want?")
+        st.caption("Seeds help life run. Wants are fun.")
+        labeled = [spend_label_with_icons(k) for k in spend_options.keys()]
+        mapping = dict(zip(labeled, list(spend_options.keys())))
+        spend_pick_label = st.selectbox("Pick one", labeled, key="spend_choice_nv")
+        spend_choice = mapping[spend_pick_label]
+        spend_amt = int(spend_options[spend_choice])
+
+        if spend_amt > remaining_wallet:
+            st.warning("That buy is too expensive after saving. pick a smaller buy or save less.")
+
+    elif lvl == 4:
+        st.subheader("Step 1: make a budget (jars)")
+        st.caption("Plan your coins: save, spend, and share.")
+
+        total = int(st.session_state.wallet)
+        save_amt = st.slider("Save jar", 0, total, min(6, total), key="jar_save")
+        remaining = total - int(save_amt)
+        spend_amt_plan = st.slider("Spend jar", 0, remaining, min(5, remaining), key="jar_spend")
+
+        st.subheader("Step 2: choose a buy (Must fit your spend jar)")
+        spend_choice = st.selectbox("Pick one", list(spend_options.keys()), key="spend_choice_budget")
+        spend_amt = int(spend_options[spend_choice])
+
+        if spend_amt > int(spend_amt_plan):
+            st.warning("That buy is bigger than your spend jar. Choose a smaller buy, or increase your spend jar.")
+
+    else:
+        st.subheader("Step 1: save first")
+        save_amt = st.slider(
+            "Save coins before spending",
+            min_value=0,
+            max_value=int(st.session_state.wallet),
+            value=min(6, int(st.session_state.wallet)),
+            key="save_slider_subs",
+        )
+
+        remaining_wallet = int(st.session_state.wallet) - int(save_amt)
+        st.subheader("Step 2: Choose a buy (optional)")
+        spend_choice = st.selectbox("Pick one", list(spend_options.keys()), key="spend_choice_subs")
+        spend_amt = int(spend_options[spend_choice])
+
+        if spend_amt > remaining_wallet:
+            st.warning("That buy is too expensive after saving. pick a smaller buy or save less.")
+
+        if lvl >= 6:
+            st.subheader("Step 3: Growth test (risk)")
+            do_growth_test = st.checkbox("use 5 coins for a growth test (can give back 4-7 coins)", key="growth_test_chk")
+            st.caption("This teaches risk: it can go up or down. do not risk coins you need soon.")
+
+    finish = st.button("Finish this mission", key="finish_mission_btn", disabled=no_coins)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if finish:
+        if lvl == 4:
+            total = int(st.session_state.wallet)
+            planned_spend = int(st.session_state["jar_spend"])
+            planned_save = int(st.session_state["jar_save"])
+            if planned_save + planned_spend > total:
+                st.error("Your jars do not fit your wallet. try again.")
+                st.stop()
+            if spend_amt > planned_spend:
+                st.error("That buy is bigger than your spend jar. choose a smaller buy.")
+                st.stop()
+            save_amt = planned_save
+
+        try:
+            with section("play settlement"):
+                summary = game_engine().finish_mission(int(save_amt), int(spend_amt), do_growth_test)
+        except MissionError as exc:
+            st.error(str(exc))
+        else:
+            if summary["growth_skipped"]:
+                st.warning("Not enough wallet coins for the growth test after your choices.")
+
+            st.session_state.play_step = "Today’s learning"
+            persist()
+            st.balloons()
+            st.rerun()
+
+    if st.session_state.last_mission_summary:
+        s = st.session_state.last_mission_summary
+        st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+        st.subheader("Mission Summary 🧾")
+        c1, c2, c3, c4 = st.columns(4)
+        with c1:
+            st.write(f"saved: {s['saved']}")
+        with c2:
+            st.write(f"spent: {s['spent']}")
+        with c3:
+            st.write(f"stars earned: {s['stars_earned']}")
+        with c4:
+            st.write(s["goal_text"])
+        if s.get("star_reasons"):
+            st.caption(" · ".join(s["star_reasons"]))
+
+        st.progress(compute_progress(int(st.session_state.bank), int(st.session_state.goal_amount)))
+        st.caption(
+            f"goal: {st.session_state.goal_name} ({int(st.session_state.goal_amount)} coins): "
+            f"{goal_forecast().goals[0].describe()}"
+        )
+
+        for line in s["lines"]:
+            st.write("- " + line)
+
+        if s["growth_result"] is not None:
+            st.write(f"- growth test result: you got back {s['growth_result']} coins.")
+
+        if s["surprise_text"]:
+            st.write("- " + s["surprise_text"])
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    if int(st.session_state.bank) >= int(st.session_state.goal_amount):
+        st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+        st.subheader("Buy My Goal 🎯")
+        st.write(f"goal: {st.session_state.goal_name} ({int(st.session_state.goal_amount)} coins)")
+        if st.button("Buy my goal now", key="buy_goal_btn"):
+            game_engine().buy_goal()
+            st.session_state.last_mission_summary = None
+            st.success("You bought your goal. new goal unlocked.")
+            persist()
+            st.rerun()
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    if lvl >= 6:
+        growth_lab_panel()
+
+if st.session_state.play_step == "Today’s learning":
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader("Today’s Learning 🧠")
+    st.caption("You get 2 tries. stars only count the first time you get it correct.")
+
+    daily_question_panel("quiz")
+    st.markdown("---")
+    daily_question_panel("puzzle")
+
+    st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,65 @@
+"""Kids page: Progress charts."""
+import streamlit as st
+
+from app_state import clamp, compute_progress, goal_forecast, level_unlock_rule, progress_chart
+from profiler import section
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("My Progress 📈")
+st.write(f"Grade: {int(st.session_state.child_grade)} 🎒")
+st.write(f"level: {int(st.session_state.level)}")
+st.write(f"Streak: {int(st.session_state.streak)} missions 🔥")
+st.write(f"Stars: {int(st.session_state.stars)} ⭐")
+st.progress(compute_progress(int(st.session_state.bank), int(st.session_state.goal_amount)))
+st.caption(f"goal: {st.session_state.goal_name} ({int(st.session_state.goal_amount)} coins)")
+forecast = goal_forecast()
+st.write(f"🔮 {forecast.goals[0].describe()}")
+with st.expander("other goals"):
+    st.dataframe(
+        {
+            "goal": [g.name for g in forecast.goals[1:]],
+            "coins": [g.amount for g in forecast.goals[1:]],
+            "missions to go": [g.describe() for g in forecast.goals[1:]],
+        },
+        hide_index=True,
+    )
+    if forecast.missions_used:
+        st.caption(f"based on how you saved and spent in your last {forecast.missions_used} missions.")
+    else:
+        st.caption("a guess until you have played a few missions: saving half of each allowance.")
+st.markdown("</div>", unsafe_allow_html=True)
+
+ZOOM_LABELS = {"missions": "recent missions", "days": "by day", "weeks": "by week"}
+
+history = st.session_state.history
+missions = history.events("mission_end")
+if missions.size:
+    with section("progress charts"):
+        zooms = ["missions"] + [z for z in ("days", "weeks") if progress_chart(z).points > 1]
+        zoom = "missions"
+        if len(zooms) > 1:
+            zoom = st.radio(
+                "show", zooms, format_func=ZOOM_LABELS.get, horizontal=True, key="progress_zoom", label_visibility="collapsed"
+            )
+        series = progress_chart(zoom)
+
+        st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+        st.subheader("piggy bank over time" if zoom == "missions" else f"highest piggy bank {ZOOM_LABELS[zoom]}")
+        st.line_chart(dict(series.bank), x=series.x, y="bank")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+        st.subheader("saved vs. spent each mission" if zoom == "missions" else f"saved vs. spent {ZOOM_LABELS[zoom]}")
+        st.line_chart(dict(series.flows), x=series.x, y=["saved", "spent"])
+        if zoom == "missions" and history.total("missions") > missions.size:
+            st.caption(f"showing your last {missions.size} missions. pick by day or by week to see older ones.")
+        st.markdown("</div>", unsafe_allow_html=True)
+else:
+    st.info("play at least one mission to see charts.")
+
+next_level = clamp(int(st.session_state.level) + 1, 1, 6)
+if next_level != int(st.session_state.level) and level_unlock_rule(next_level, int(st.session_state.stars)):
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader("Level Up Available 🚀")
+    st.write(f"You unlocked level {next_level}. switch your level in parents mode.")
+    st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,60 @@
+"""Kids page: Rewards shop and theme picker."""
+import streamlit as st
+
+from app_state import game_engine, has_reward, persist, rerun_panel, unlock_reward
+from content import SHOP_ITEMS
+
+@st.fragment
+def shop_panel():
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader("Shop Items 🛍️")
+    st.write(f"Your stars: {int(st.session_state.stars)}")
+    for item_name, cost in SHOP_ITEMS:
+        owned = has_reward(item_name)
+        c1, c2, c3 = st.columns([2, 1, 1])
+        with c1:
+            st.write(f"{item_name}")
+        with c2:
+            st.write(f"{cost} stars")
+        with c3:
+            if owned:
+                st.success("owned")
+            else:
+                if st.button("buy", key=f"buy_{item_name}"):
+                    if int(st.session_state.stars) >= int(cost):
+                        game_engine().add_stars(-int(cost))
+                        unlock_reward(item_name)
+                        st.success(f"you bought {item_name}")
+                        persist()
+                        # The theme picker lives outside this panel.
+                        rerun_panel(full=item_name == "Theme Badge")
+                    else:
+                        st.error("not enough stars yet")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader("My Rewards 🎉")
+    if st.session_state.unlocked_rewards:
+        st.write(", ".join(sorted(list(st.session_state.unlocked_rewards))))
+    else:
+        st.write("No rewards yet. Earn stars by playing and doing today’s learning.")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Rewards Shop 🎁")
+st.caption("Spend stars to unlock fun upgrades that change your app.")
+st.markdown("</div>", unsafe_allow_html=True)
+
+if has_reward("Theme Badge"):
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader("Choose Your Theme 🎨")
+    theme_choices = sorted(list(st.session_state.unlocked_themes))
+    new_theme = st.selectbox("theme", theme_choices, index=theme_choices.index(st.session_state.theme_name), key="theme_pick")
+    if new_theme != st.session_state.theme_name:
+        st.session_state.theme_name = new_theme
+        st.success(f"theme applied: {new_theme}")
+        persist()
+        st.rerun()
+    st.markdown("</div>", unsafe_allow_html=True)
+
+shop_panel()
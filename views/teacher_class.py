@@ -0,0 +1,72 @@
+"""Teacher page: compare every child in this class (the signed-in household).
+
+Only the household behind the parent PIN is shown. Other classes and
+district-wide prefixes need a teacher credential scoped to the classes a
+teacher owns, which the app does not have yet; until then they are only
+available to whoever holds the database, through ``cohort_stats.CohortStats``.
+"""
+import streamlit as st
+
+from app_state import cohort_stats, household_id
+from content_packs import levels
+from profiler import section
+from profiles import child_label
+
+REFRESH_SECONDS = 30
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Class Dashboard 🏫")
+st.caption(f"class {household_id()}: children are numbered, never named.")
+st.markdown("</div>", unsafe_allow_html=True)
+
+
+def profile_label(profile):
+    return child_label(profile.split("/", 1)[1])
+
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def dashboard():
+    # Only children saved since the last look are read again.
+    stats = cohort_stats(f"{household_id()}/")
+    with section("class refresh"):
+        stats.refresh()
+        summary = stats.summary()
+    if not summary.children:
+        st.info("no saved children in this class yet.")
+        return
+
+    by_level = summary.by_level
+    names = levels()
+    st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+    st.subheader(f"{summary.children} children")
+    st.dataframe(
+        [
+            {
+                "level": f"{int(level)} - {names[int(level)]['name']}" if int(level) in names else int(level),
+                "children": int(by_level["children"][i]),
+                "save rate": f"{by_level['save_rate'][i]:.0%}",
+                "goal reached": f"{by_level['goal_rate'][i]:.0%}",
+                "missions": round(float(by_level["missions"][i]), 1),
+                "stars": round(float(by_level["stars"][i]), 1),
+                "streak": round(float(by_level["streak"][i]), 1),
+                "best streak": round(float(by_level["best_streak"][i]), 1),
+                "quiz accuracy": f"{by_level['quiz_accuracy'][i]:.0%}",
+                "ready for next level": int(by_level["ready"][i]),
+            }
+            for i, level in enumerate(by_level["level"])
+        ],
+        hide_index=True,
+    )
+    st.caption(f"averages per child; refreshed every {REFRESH_SECONDS} s.")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if summary.ready:
+        st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+        st.subheader("ready to level up 🚀")
+        st.write(", ".join(profile_label(p) for p in summary.ready[:200]))
+        if len(summary.ready) > 200:
+            st.caption(f"and {len(summary.ready) - 200} more.")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+
+dashboard()
@@ -0,0 +1,10 @@
+"""Kids page: Welcome."""
+import streamlit as st
+
+st.markdown('<div class="kid-card">', unsafe_allow_html=True)
+st.subheader("Welcome 👋")
+st.write("This app teaches money through missions. each mission is one play session.")
+st.write("You earn coins, make choices, and grow your piggy bank.")
+st.caption("Tip: saving first makes your goal happen faster.")
+st.caption("Demo parent pin: 1234")
+st.markdown("</div>", unsafe_allow_html=True)